@@ -6,6 +6,9 @@ Features: Zoom, Pan, Drag-and-Drop points, Millimeter dimensions
 
 import argparse
 import logging
+import math
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 import cv2  # For perspective transforms, color conversion, and text rendering
 import cv3  # For basic I/O and drawing operations
@@ -13,13 +16,24 @@ import numpy as np
 import tkinter as tk
 from tkinter import filedialog, ttk  # Convenience imports for dialogs and themed widgets
 from PIL import Image, ImageTk
-from pillow_heif import register_heif_opener  # For HEIC file support
 
 # Import our modules
-from lib import UnitConverter, ImageCanvas, CornerDetector, ScaleCalibrator
+from lib import UnitConverter, ImageCanvas, CornerDetector, ScaleCalibrator, PerspectiveWarper
 
-# Register HEIF opener with Pillow to enable HEIC support
-register_heif_opener()
+_heif_registered = False
+
+
+def register_heif_support():
+    """Register the HEIF opener with Pillow to enable HEIC support
+
+    pillow-heif loads libheif and its codecs, so it is only imported when
+    the first HEIC/HEIF file is opened rather than at startup.
+    """
+    global _heif_registered
+    if not _heif_registered:
+        from pillow_heif import register_heif_opener
+        register_heif_opener()
+        _heif_registered = True
 
 
 class DewarpGUI:
@@ -42,6 +56,30 @@ class DewarpGUI:
         "Index Card": (127.0, 76.2),
     }
 
+    # Number of recent transform geometries kept by apply_transform
+    WARP_CACHE_SIZE = 4
+
+    # Quiet period (ms) after a dimension edit before the transform is re-applied
+    TRANSFORM_DEBOUNCE_MS = 120
+
+    # How often (ms) the Tk loop checks for a finished background warp
+    WARP_POLL_MS = 10
+
+    # Minimum time (ms) between redraws while dragging (about 60 per second)
+    REDRAW_INTERVAL_MS = 16
+
+    # Images with a longer side than this are edited on a downscaled working copy
+    MAX_WORKING_SIZE = 4096
+
+    # How often (ms) the Tk loop checks for a finished background image load
+    LOAD_POLL_MS = 50
+
+    # How often (ms) the Tk loop checks for finished background corner detection
+    DETECT_POLL_MS = 20
+
+    # Interpolation for the final result; previews use bilinear (or nearest while dragging)
+    RESULT_INTERPOLATION = cv2.INTER_CUBIC
+
     def get_page_size_display_names(self):
         """Generate display names for page sizes (without dimensions)"""
         display_names = []
@@ -99,9 +137,26 @@ class DewarpGUI:
         self.image = None
         self.display_image = None
         self.original_image = None
+        self.original_full = None  # Full resolution source when original_image is a downscaled working copy
+        self._source_scale = 1.0  # original_image size relative to original_full
         self.original_file_path = None
         self.points = []
         self.transformed_image = None
+        self._preview_dst = None  # Reusable warp buffer for drag previews (never shown directly)
+        self._warp_executor = ThreadPoolExecutor(max_workers=1)  # Runs apply_transform warps off the Tk thread
+        self._warp_generation = 0  # Bumped per result; stale background warps are discarded
+        self._preview_mode = True  # Warp results at canvas resolution until full resolution is needed
+        self._result_full_res = None  # (M_inv, width, height) while transformed_image is a preview rendering
+        self._full_res_job = None  # (generation, future, callbacks) for the full resolution render in flight
+        self._pending_after = None  # Debounced apply_transform scheduled by _schedule_transform
+        self._redraw_pending = False  # A _do_redraw is scheduled
+        self._dirty = set()  # Views waiting for _do_redraw: "canvas", "tab_canvas", "preview"
+        self._last_display_fp = {}  # Last drawn state per left canvas, to skip no-op redraws
+        self._warp_cache = OrderedDict()  # Recent apply_transform geometry for the current original
+        self._load_executor = ThreadPoolExecutor(max_workers=1)  # Decodes images off the Tk thread
+        self._load_generation = 0  # Bumped per load request; superseded loads are discarded
+        self._detect_executor = ThreadPoolExecutor(max_workers=1)  # Runs corner detection off the Tk thread
+        self._detect_generation = 0  # Bumped per detection request; stale detections are discarded
 
         # Canvas dimensions (will be set in setup_ui)
         self.canvas_width = 500  # Initial placeholder
@@ -125,6 +180,9 @@ class DewarpGUI:
         # Corner detector (automatic document corner detection)
         self.corner_detector = CornerDetector()
 
+        # Perspective warper (uses CUDA when available, CPU otherwise)
+        self.warper = PerspectiveWarper()
+
         # Layout mode tracking
         self.layout_mode = "side-by-side"  # or "tabbed"
         self.layout_threshold_width = 800  # Switch to tabbed mode below this width
@@ -133,6 +191,7 @@ class DewarpGUI:
 
         # DPI for mm conversion (from command line or default 300 DPI)
         self.dpi = dpi
+        self._dpi_int = dpi  # Parsed dpi_var, kept in sync by on_dpi_changed
         self.dpi_var = tk.StringVar(value=str(dpi))
         self.dpi_var.trace_add('write', self.on_dpi_changed)
 
@@ -141,6 +200,8 @@ class DewarpGUI:
 
         # Units preference (from command line or default mm)
         self.units = tk.StringVar(value=units)
+        self._units_str = units  # Cached units value, kept in sync by on_units_changed
+        self._update_units_factor()
         self._previous_units = units  # Track previous units for conversion
         self.units.trace_add('write', self.on_units_changed)
 
@@ -450,16 +511,13 @@ class DewarpGUI:
         # Bind window resize to check for layout mode change
         self.root.bind("<Configure>", self.on_window_resize)
 
+    def _update_units_factor(self):
+        """Recompute the pixels-per-unit factor for the current units and DPI"""
+        self._units_factor = self.unit_converter.pixels_per_unit(self._units_str, self._dpi_int)
+
     def units_to_pixels(self, value):
         """Convert value in current units to pixels based on DPI"""
-        try:
-            dpi = int(self.dpi_var.get())
-        except ValueError:
-            dpi = 300
-
-        self.unit_converter.set_dpi(dpi)
-        self.unit_converter.set_units(self.units.get())
-        return self.unit_converter.units_to_pixels(value)
+        return int(value * self._units_factor)
 
     def pixels_to_units(self, pixels, dpi=None):
         """Convert pixels to current units based on DPI
@@ -469,26 +527,29 @@ class DewarpGUI:
             dpi: DPI to use for conversion (defaults to output DPI)
         """
         if dpi is None:
-            try:
-                dpi = int(self.dpi_var.get())
-            except ValueError:
-                dpi = 300
+            dpi = self._dpi_int
 
         self.unit_converter.set_dpi(dpi)
-        self.unit_converter.set_units(self.units.get())
+        self.unit_converter.set_units(self._units_str)
         return self.unit_converter.pixels_to_units(pixels)
 
     def on_dimension_changed(self, *args):
         """Called when width or height field is modified"""
         # Only mark as manually set if we're not programmatically updating
         if not self._updating_dimensions:
-            logging.info(f"Dimensions manually changed: width={self.width_var.get()}, height={self.height_var.get()}")
+            logging.info("Dimensions manually changed: width=%s, height=%s", self.width_var.get(), self.height_var.get())
             self.dimensions_manually_set = True
             # User manually changed dimensions, reset to Custom
             self.page_size_var.set("Custom")
-            # Auto-apply transform if we have 4 corners
+            # Auto-apply transform if we have 4 corners (once typing pauses)
             if len(self.points) == 4 and self.image is not None:
-                self.apply_transform()
+                self._schedule_transform()
+
+    def _schedule_transform(self):
+        """Apply the transform after a short pause, coalescing rapid edits into one warp"""
+        if self._pending_after is not None:
+            self.root.after_cancel(self._pending_after)
+        self._pending_after = self.root.after(self.TRANSFORM_DEBOUNCE_MS, self.apply_transform)
 
     def on_page_size_changed(self, event=None):
         """Called when page size is selected from dropdown"""
@@ -502,7 +563,7 @@ class DewarpGUI:
             width_mm, height_mm = page_dims
 
             # Convert to current units
-            units = self.units.get()
+            units = self._units_str
             if units == "mm":
                 width_val = width_mm
                 height_val = height_mm
@@ -510,10 +571,7 @@ class DewarpGUI:
                 width_val = width_mm / 25.4
                 height_val = height_mm / 25.4
             elif units == "pixels":
-                try:
-                    dpi = int(self.dpi_var.get())
-                except ValueError:
-                    dpi = 300
+                dpi = self._dpi_int
                 width_val = (width_mm / 25.4) * dpi
                 height_val = (height_mm / 25.4) * dpi
 
@@ -538,15 +596,25 @@ class DewarpGUI:
         """Called when DPI is modified"""
         try:
             dpi_value = int(self.dpi_var.get())
+        except ValueError:
+            # Invalid values fall back to the default DPI
+            self._dpi_int = 300
+            self._update_units_factor()
+            return
+        self._dpi_int = dpi_value
+        self._update_units_factor()
+        try:
             self.dpi_display_label.config(text=f"DPI: {dpi_value}")
-        except (ValueError, tk.TclError, AttributeError):
-            # Ignore errors during initialization or invalid values
+        except (tk.TclError, AttributeError):
+            # Ignore errors during initialization
             pass
 
     def on_units_changed(self, *args):
         """Called when units preference is modified"""
         try:
             new_units = self.units.get()
+            self._units_str = new_units
+            self._update_units_factor()
             old_units = getattr(self, '_previous_units', new_units)
             if old_units != new_units:
                 logging.info(f"Units changed from {old_units} to {new_units}")
@@ -560,7 +628,7 @@ class DewarpGUI:
                     if width_str and height_str:
                         width_val = float(width_str)
                         height_val = float(height_str)
-                        dpi = int(self.dpi_var.get()) if hasattr(self, 'dpi_var') else 300
+                        dpi = self._dpi_int
 
                         # Use converter to convert from old units to new units
                         new_width = self.unit_converter.convert_units(width_val, old_units, new_units, dpi)
@@ -608,10 +676,15 @@ class DewarpGUI:
         """Move the result image to the original pane for further editing"""
         if self.transformed_image is None:
             return
+        if not self._ensure_full_res_result(self.use_result_as_original, exact=True):
+            return  # Runs again once the final result has been rendered
 
         # Save the result as the new original
         self.original_image = self.transformed_image.copy()
         self.image = self.transformed_image.copy()
+        self.original_full = None
+        self._source_scale = 1.0
+        self._warp_cache.clear()
 
         # Reset points and result
         self.points = []
@@ -634,8 +707,8 @@ class DewarpGUI:
         self.display_on_tab_canvas()
 
         # Clear result canvases
-        self.result_canvas.delete("all")
-        self.tab_result_canvas.delete("all")
+        self.right_canvas.clear()
+        self.tab_right_canvas.clear()
 
         self.status_label.config(text="Result moved to original. Click 4 corners to continue editing.")
 
@@ -698,8 +771,12 @@ class DewarpGUI:
 
         # Rotate the image (clockwise = -90, counter-clockwise = 90)
         rotation_code = cv2.ROTATE_90_CLOCKWISE if clockwise else cv2.ROTATE_90_COUNTERCLOCKWISE
-        self.original_image = cv2.rotate(self.original_image, rotation_code)
+        # The warp source must stay C-contiguous (a no-op for OpenCV's fresh output)
+        self.original_image = np.ascontiguousarray(cv2.rotate(self.original_image, rotation_code))
+        if self.original_full is not None:
+            self.original_full = cv2.rotate(self.original_full, rotation_code)
         self.image = self.original_image.copy()
+        self._warp_cache.clear()
 
         # Clear points and result since rotation invalidates them
         self.points = []
@@ -722,14 +799,13 @@ class DewarpGUI:
         self.display_on_tab_canvas()
 
         # Clear result canvases
-        self.result_canvas.delete("all")
-        self.tab_result_canvas.delete("all")
+        self.right_canvas.clear()
+        self.tab_right_canvas.clear()
 
         # Auto-detect corners if preference is enabled
         if self.auto_detect_on_load.get():
+            # Detection reports its own result in the status bar when it finishes
             self.auto_detect_corners(show_debug=False)
-            direction = "clockwise" if clockwise else "counter-clockwise"
-            self.status_label.config(text=f"Image rotated 90 deg {direction}. Corners auto-detected.")
         else:
             direction = "clockwise" if clockwise else "counter-clockwise"
             self.status_label.config(text=f"Image rotated 90 deg {direction}. Click 4 corners to transform.")
@@ -741,8 +817,11 @@ class DewarpGUI:
 
         # Flip the image (1 = horizontal, 0 = vertical)
         flip_code = 1 if horizontal else 0
-        self.original_image = cv2.flip(self.original_image, flip_code)
+        self.original_image = np.ascontiguousarray(cv2.flip(self.original_image, flip_code))
+        if self.original_full is not None:
+            self.original_full = cv2.flip(self.original_full, flip_code)
         self.image = self.original_image.copy()
+        self._warp_cache.clear()
 
         # Clear points and result since flip invalidates them
         self.points = []
@@ -765,8 +844,8 @@ class DewarpGUI:
         self.display_on_tab_canvas()
 
         # Clear result canvases
-        self.result_canvas.delete("all")
-        self.tab_result_canvas.delete("all")
+        self.right_canvas.clear()
+        self.tab_right_canvas.clear()
 
         direction = "horizontal" if horizontal else "vertical"
         self.status_label.config(text=f"Image flipped {direction}. Click 4 corners to transform.")
@@ -775,6 +854,8 @@ class DewarpGUI:
         """Rotate the result image 90 degrees"""
         if self.transformed_image is None:
             return
+        if not self._ensure_full_res_result(lambda: self.rotate_result(clockwise), exact=True):
+            return  # Runs again once the final result has been rendered
 
         # Rotate the result image
         rotation_code = cv2.ROTATE_90_CLOCKWISE if clockwise else cv2.ROTATE_90_COUNTERCLOCKWISE
@@ -793,6 +874,8 @@ class DewarpGUI:
         """Flip the result image horizontally or vertically"""
         if self.transformed_image is None:
             return
+        if not self._ensure_full_res_result(lambda: self.flip_result(horizontal), exact=True):
+            return  # Runs again once the final result has been rendered
 
         # Flip the result image (1 = horizontal, 0 = vertical)
         flip_code = 1 if horizontal else 0
@@ -826,6 +909,10 @@ class DewarpGUI:
         if self.transformed_image is None:
             return
 
+        # Calibration points must be in full resolution result coordinates
+        if not self._ensure_full_res_result(self.start_scale_calibration_result):
+            return  # Runs again once the full resolution result has been rendered
+
         self.scale_calibrator.start_calibration("result")
         self.status_label.config(text=self.scale_calibrator.get_status_message())
 
@@ -1215,6 +1302,7 @@ class DewarpGUI:
         """Zoom in on result canvas by 20%, centered on given point"""
         if self.transformed_image is None:
             return
+        self._ensure_full_res_result()
         if self.layout_mode == "side-by-side":
             self.right_canvas.zoom_in(center_x, center_y)
             self.display_result()
@@ -1281,9 +1369,30 @@ class DewarpGUI:
             if canvas_helper.update_pan(event.x, event.y):
                 # Only update the active canvas for pan
                 if self.layout_mode == "side-by-side":
-                    self.display_on_canvas()
+                    self._request_redraw("canvas")
                 else:
-                    self.display_on_tab_canvas()
+                    self._request_redraw("tab_canvas")
+
+    def _request_redraw(self, *views):
+        """Mark views for redrawing; motion events between frames share one redraw"""
+        self._dirty.update(views)
+        if not self._redraw_pending:
+            self._redraw_pending = True
+            self.root.after(self.REDRAW_INTERVAL_MS, self._do_redraw)
+
+    def _do_redraw(self):
+        """Redraw everything marked by _request_redraw since the last frame"""
+        dirty = self._dirty
+        self._dirty = set()
+        self._redraw_pending = False
+
+        if "canvas" in dirty:
+            self.display_on_canvas()
+        if "tab_canvas" in dirty:
+            self.display_on_tab_canvas()
+        if "preview" in dirty and len(self.points) == 4:
+            self.calculate_output_dimensions()
+            self.apply_transform_preview()
 
     def load_image(self):
         file_path = filedialog.askopenfilename(
@@ -1295,43 +1404,104 @@ class DewarpGUI:
             self.load_image_from_path(file_path)
 
     def load_image_from_path(self, file_path):
-        """Load an image from the given file path"""
+        """Load an image from the given file path
+
+        The file is decoded on a worker thread; the image is installed by
+        _poll_load once it is ready.
+        """
         logging.info(f"Loading image: {file_path}")
+        self._load_generation += 1
+        self.status_label.config(text="Loading image...")
+        future = self._load_executor.submit(self._read_image_file, file_path)
+        self.root.after(self.LOAD_POLL_MS, self._poll_load, self._load_generation, future, file_path)
+
+    def _read_image_file(self, file_path):
+        """
+        Decode an image file and prepare the working copy (worker thread)
+
+        Args:
+            file_path: Path of the image to load
+
+        Returns:
+            tuple: (image, full_image, source_scale, dpi) where full_image is None
+                   unless image is a downscaled working copy, and dpi is None
+                   if the file has no DPI metadata
+
+        Raises:
+            ValueError: If the image cannot be decoded
+        """
         # Check if file is HEIC format (needs special handling)
         is_heic = file_path.lower().endswith(('.heic', '.heif'))
 
         if is_heic:
             # Load HEIC with PIL/pillow-heif, then convert to numpy array for OpenCV
             try:
+                register_heif_support()
                 pil_image = Image.open(file_path)
                 # Convert PIL image to RGB numpy array
-                self.original_image = np.array(pil_image.convert('RGB'))
+                image = np.array(pil_image.convert('RGB'))
             except Exception as e:
-                self.status_label.config(text=f"Error: Could not load HEIC image - {e}")
-                return
+                raise ValueError(f"Could not load HEIC image - {e}")
         else:
             # Load image with OpenCV for standard formats
-            self.original_image = cv3.imread(file_path)
-            if self.original_image is None:
-                self.status_label.config(text="Error: Could not load image")
-                return
-
-        # Store the original file path for save dialog
-        self.original_file_path = file_path
+            image = cv3.imread(file_path)
+            if image is None:
+                raise ValueError("Could not load image")
+
+        # Decoders may hand back strided views; OpenCV's vectorized warp wants contiguous input
+        image = np.ascontiguousarray(image)
+
+        # Edit huge images on a downscaled copy; the full image is only warped for full resolution results
+        full_image = None
+        source_scale = 1.0
+        longest_side = max(image.shape[:2])
+        if longest_side > self.MAX_WORKING_SIZE:
+            source_scale = self.MAX_WORKING_SIZE / longest_side
+            full_image = image
+            image = cv2.resize(full_image, None, fx=source_scale, fy=source_scale, interpolation=cv2.INTER_AREA)
+            logging.info(f"Working on a {source_scale:.2f}x copy of the {longest_side}px image")
 
         # Read DPI from image metadata using PIL
+        dpi = None
         try:
-            pil_image = Image.open(file_path)
-            dpi_info = pil_image.info.get('dpi')
+            dpi_info = Image.open(file_path).info.get('dpi')
             if dpi_info:
                 # DPI info is a tuple (x_dpi, y_dpi), use x_dpi
-                self.input_dpi = int(dpi_info[0])
-            else:
-                # No DPI metadata found, use output DPI as default
-                self.input_dpi = int(self.dpi_var.get())
+                dpi = int(dpi_info[0])
         except Exception:
-            # If we can't read DPI, use output DPI as default
-            self.input_dpi = int(self.dpi_var.get())
+            pass
+
+        return image, full_image, source_scale, dpi
+
+    def _poll_load(self, generation, future, file_path):
+        """Install a finished background load, or check again shortly"""
+        if generation != self._load_generation:
+            return  # A newer load has been requested
+        if not future.done():
+            self.root.after(self.LOAD_POLL_MS, self._poll_load, generation, future, file_path)
+            return
+
+        try:
+            image, full_image, source_scale, dpi = future.result()
+        except ValueError as e:
+            self.status_label.config(text=f"Error: {e}")
+            return
+        except Exception as e:
+            # Decoder, resize or allocation failures (cv2.error, MemoryError, ...)
+            logging.error(f"Image load failed: {str(e)}")
+            self.status_label.config(text=f"Error: Could not load image - {e}")
+            return
+
+        self.original_image = image
+        self.original_full = full_image
+        self._source_scale = source_scale
+
+        # Store the original file path for save dialog
+        self.original_file_path = file_path
+        self._warp_cache.clear()
+
+        # Without DPI metadata, use output DPI as default
+        self.input_dpi = dpi if dpi is not None else self._dpi_int
 
         # cv3 loads images in RGB by default (no conversion needed)
         self.image = self.original_image
@@ -1365,68 +1535,49 @@ class DewarpGUI:
         if self.auto_detect_on_load.get():
             self.auto_detect_corners(show_debug=False)
 
+    def _update_scale_overlay(self, canvas_helper):
+        """Show the scale calibration line on a result canvas while calibrating the result"""
+        scale_points = self.scale_points if self.scale_mode == "result" else ()
+        canvas_helper.set_overlay(scale_points=scale_points)
+
+    def _update_points_overlay(self, canvas_helper):
+        """Show the corner points and connecting lines on a left canvas"""
+        # Draw scale calibration line if in scale mode for original
+        scale_points = self.scale_points if self.scale_mode == "original" else ()
+
+        # If we have 4 points, reorder them to form a proper quadrilateral
+        closed = len(self.points) == 4
+        quad_points = self.order_points(self.points) if closed else self.points
+
+        canvas_helper.set_overlay(quad_points=quad_points, closed=closed,
+                                  corner_points=self.points, scale_points=scale_points)
+
+    def _display_fingerprint(self, canvas_helper):
+        """Summarize everything that affects the image a left canvas shows"""
+        return (canvas_helper.zoom_level, canvas_helper.pan_offset[0], canvas_helper.pan_offset[1],
+                canvas_helper.needs_initial_center, canvas_helper.canvas_width, canvas_helper.canvas_height,
+                canvas_helper.photo is None, id(self.image))
+
+    def _display_unchanged(self, key, canvas_helper):
+        """Return True if the canvas already shows the current state, else record it"""
+        fp = self._display_fingerprint(canvas_helper)
+        last = self._last_display_fp.get(key)
+        if last is not None and last[0] == fp:
+            return True
+        # Keep a reference to the image so its id() cannot be reused while recorded
+        self._last_display_fp[key] = (fp, self.image)
+        return False
+
     def display_on_canvas(self):
         if self.image is None:
             return
 
-        # Define overlay callback to draw points and lines
-        def draw_points_overlay(canvas_image, effective_scale, pan_offset):
-            # Draw scale calibration line if in scale mode for original
-            if self.scale_mode == "original" and len(self.scale_points) > 0:
-                # Draw line first if we have 2 points
-                if len(self.scale_points) == 2:
-                    pt1_x, pt1_y = self.left_canvas.image_to_canvas_coords(
-                        self.scale_points[0][0], self.scale_points[0][1])
-                    pt2_x, pt2_y = self.left_canvas.image_to_canvas_coords(
-                        self.scale_points[1][0], self.scale_points[1][1])
-                    # Draw thin cyan line
-                    cv3.line(canvas_image, int(pt1_x), int(pt1_y),
-                            int(pt2_x), int(pt2_y), color=(0, 255, 255), t=1)
-
-                # Draw endpoints on top with smaller circles
-                for i, pt in enumerate(self.scale_points):
-                    pt_x, pt_y = self.left_canvas.image_to_canvas_coords(pt[0], pt[1])
-                    pt_x, pt_y = int(pt_x), int(pt_y)
-                    # Outer circle (cyan)
-                    cv3.circle(canvas_image, pt_x, pt_y, 5, color=(0, 255, 255), t=1)
-                    # Inner filled circle (cyan)
-                    cv3.circle(canvas_image, pt_x, pt_y, 3, color=(0, 255, 255), fill=True)
-
-            # Draw lines connecting points
-            # If we have 4 points, reorder them to form a proper quadrilateral
-            if len(self.points) == 4:
-                ordered_rect = self.order_points(self.points)
-                points_to_draw = ordered_rect
-            else:
-                points_to_draw = self.points
-
-            for i in range(len(points_to_draw)):
-                if i < len(points_to_draw) - 1 or len(points_to_draw) == 4:
-                    next_i = (i + 1) % len(points_to_draw)
-                    pt1_x, pt1_y = self.left_canvas.image_to_canvas_coords(
-                        points_to_draw[i][0], points_to_draw[i][1])
-                    pt2_x, pt2_y = self.left_canvas.image_to_canvas_coords(
-                        points_to_draw[next_i][0], points_to_draw[next_i][1])
-
-                    # Draw line (OpenCV automatically clips to image bounds)
-                    cv3.line(canvas_image, int(pt1_x), int(pt1_y),
-                            int(pt2_x), int(pt2_y), color=(0, 255, 0), t=2)
-
-            # Draw points on top
-            for i, pt in enumerate(self.points):
-                pt_x, pt_y = self.left_canvas.image_to_canvas_coords(pt[0], pt[1])
-                pt_x, pt_y = int(pt_x), int(pt_y)
-
-                # Only draw if within canvas bounds (with some margin for visibility)
-                if -20 <= pt_x < self.left_canvas.canvas_width + 20 and \
-                   -20 <= pt_y < self.left_canvas.canvas_height + 20:
-                    # Outer circle (same size as scale points)
-                    cv3.circle(canvas_image, pt_x, pt_y, 5, color=(0, 0, 255), t=1)
-                    # Inner filled circle (same size as scale points)
-                    cv3.circle(canvas_image, pt_x, pt_y, 3, color=(255, 0, 0), fill=True)
-
-        # Display image with overlay
-        self.left_canvas.display_image(self.image, overlay_callback=draw_points_overlay)
+        # Points and lines are canvas items; moving them needs no image redraw
+        self._update_points_overlay(self.left_canvas)
+        if self._display_unchanged("left", self.left_canvas):
+            return
+
+        self.left_canvas.display_image(self.image, static=True)
         self.update_zoom_display()
 
     def display_on_tab_canvas(self):
@@ -1434,64 +1585,12 @@ class DewarpGUI:
         if self.image is None:
             return
 
-        # Define overlay callback to draw points and lines
-        def draw_points_overlay(canvas_image, effective_scale, pan_offset):
-            # Draw scale calibration line if in scale mode for original
-            if self.scale_mode == "original" and len(self.scale_points) > 0:
-                # Draw line first if we have 2 points
-                if len(self.scale_points) == 2:
-                    pt1_x, pt1_y = self.tab_left_canvas.image_to_canvas_coords(
-                        self.scale_points[0][0], self.scale_points[0][1])
-                    pt2_x, pt2_y = self.tab_left_canvas.image_to_canvas_coords(
-                        self.scale_points[1][0], self.scale_points[1][1])
-                    # Draw thin cyan line
-                    cv3.line(canvas_image, int(pt1_x), int(pt1_y),
-                            int(pt2_x), int(pt2_y), color=(0, 255, 255), t=1)
-
-                # Draw endpoints on top with smaller circles
-                for i, pt in enumerate(self.scale_points):
-                    pt_x, pt_y = self.tab_left_canvas.image_to_canvas_coords(pt[0], pt[1])
-                    pt_x, pt_y = int(pt_x), int(pt_y)
-                    # Outer circle (cyan)
-                    cv3.circle(canvas_image, pt_x, pt_y, 5, color=(0, 255, 255), t=1)
-                    # Inner filled circle (cyan)
-                    cv3.circle(canvas_image, pt_x, pt_y, 3, color=(0, 255, 255), fill=True)
-
-            # Draw lines connecting points
-            # If we have 4 points, reorder them to form a proper quadrilateral
-            if len(self.points) == 4:
-                ordered_rect = self.order_points(self.points)
-                points_to_draw = ordered_rect
-            else:
-                points_to_draw = self.points
-
-            for i in range(len(points_to_draw)):
-                if i < len(points_to_draw) - 1 or len(points_to_draw) == 4:
-                    next_i = (i + 1) % len(points_to_draw)
-                    pt1_x, pt1_y = self.tab_left_canvas.image_to_canvas_coords(
-                        points_to_draw[i][0], points_to_draw[i][1])
-                    pt2_x, pt2_y = self.tab_left_canvas.image_to_canvas_coords(
-                        points_to_draw[next_i][0], points_to_draw[next_i][1])
-
-                    # Draw line
-                    cv3.line(canvas_image, int(pt1_x), int(pt1_y),
-                            int(pt2_x), int(pt2_y), color=(0, 255, 0), t=2)
-
-            # Draw points on top
-            for i, pt in enumerate(self.points):
-                pt_x, pt_y = self.tab_left_canvas.image_to_canvas_coords(pt[0], pt[1])
-                pt_x, pt_y = int(pt_x), int(pt_y)
-
-                # Only draw if within canvas bounds
-                if -20 <= pt_x < self.tab_left_canvas.canvas_width + 20 and \
-                   -20 <= pt_y < self.tab_left_canvas.canvas_height + 20:
-                    # Outer circle (same size as scale points)
-                    cv3.circle(canvas_image, pt_x, pt_y, 5, color=(0, 0, 255), t=1)
-                    # Inner filled circle (same size as scale points)
-                    cv3.circle(canvas_image, pt_x, pt_y, 3, color=(255, 0, 0), fill=True)
-
-        # Display image with overlay
-        self.tab_left_canvas.display_image(self.image, overlay_callback=draw_points_overlay)
+        # Points and lines are canvas items; moving them needs no image redraw
+        self._update_points_overlay(self.tab_left_canvas)
+        if self._display_unchanged("tab_left", self.tab_left_canvas):
+            return
+
+        self.tab_left_canvas.display_image(self.image, static=True)
         # Update zoom label
         zoom_pct = self.tab_left_canvas.get_zoom_percentage()
         self.tab_zoom_label.config(text=f"{zoom_pct}%")
@@ -1501,30 +1600,8 @@ class DewarpGUI:
         if self.transformed_image is None:
             return
 
-        # Define overlay callback to draw scale line if in result scale mode
-        def draw_scale_overlay(canvas_image, effective_scale, pan_offset):
-            if self.scale_mode == "result" and len(self.scale_points) > 0:
-                # Draw line first if we have 2 points
-                if len(self.scale_points) == 2:
-                    pt1_x, pt1_y = self.tab_right_canvas.image_to_canvas_coords(
-                        self.scale_points[0][0], self.scale_points[0][1])
-                    pt2_x, pt2_y = self.tab_right_canvas.image_to_canvas_coords(
-                        self.scale_points[1][0], self.scale_points[1][1])
-                    # Draw thin cyan line
-                    cv3.line(canvas_image, int(pt1_x), int(pt1_y),
-                            int(pt2_x), int(pt2_y), color=(0, 255, 255), t=1)
-
-                # Draw endpoints on top with smaller circles
-                for i, pt in enumerate(self.scale_points):
-                    pt_x, pt_y = self.tab_right_canvas.image_to_canvas_coords(pt[0], pt[1])
-                    pt_x, pt_y = int(pt_x), int(pt_y)
-                    # Outer circle (cyan)
-                    cv3.circle(canvas_image, pt_x, pt_y, 5, color=(0, 255, 255), t=1)
-                    # Inner filled circle (cyan)
-                    cv3.circle(canvas_image, pt_x, pt_y, 3, color=(0, 255, 255), fill=True)
-
-        overlay_callback = draw_scale_overlay if self.scale_mode == "result" else None
-        self.tab_right_canvas.display_image(self.transformed_image, overlay_callback=overlay_callback)
+        self._update_scale_overlay(self.tab_right_canvas)
+        self.tab_right_canvas.display_image(self.transformed_image)
         zoom_pct = self.tab_right_canvas.get_zoom_percentage()
         self.tab_result_zoom_label.config(text=f"{zoom_pct}%")
 
@@ -1532,14 +1609,18 @@ class DewarpGUI:
         """Find if there's a point near the given position"""
         # Use appropriate canvas based on layout mode
         canvas_helper = self.left_canvas if self.layout_mode == "side-by-side" else self.tab_left_canvas
+        return self._nearest_point_index(canvas_helper, self.points, x, y, threshold)
 
-        for i, pt in enumerate(self.points):
-            scaled_x, scaled_y = canvas_helper.image_to_canvas_coords(pt[0], pt[1])
+    @staticmethod
+    def _nearest_point_index(canvas_helper, points, x, y, threshold):
+        """Index of the point closest to canvas position (x, y) if within threshold, else None"""
+        if len(points) == 0:
+            return None
 
-            distance = np.sqrt((x - scaled_x)**2 + (y - scaled_y)**2)
-            if distance < threshold:
-                return i
-        return None
+        # Compare squared canvas distances for all points at once
+        d2 = ((canvas_helper.image_to_canvas_coords_array(points) - (x, y)) ** 2).sum(axis=1)
+        idx = int(d2.argmin())
+        return idx if d2[idx] < threshold * threshold else None
 
     def get_scale_point_at_position(self, x, y, threshold=10):
         """Find if there's a scale point near the given position"""
@@ -1554,13 +1635,7 @@ class DewarpGUI:
         else:
             return None
 
-        for i, pt in enumerate(self.scale_points):
-            scaled_x, scaled_y = canvas_helper.image_to_canvas_coords(pt[0], pt[1])
-
-            distance = np.sqrt((x - scaled_x)**2 + (y - scaled_y)**2)
-            if distance < threshold:
-                return i
-        return None
+        return self._nearest_point_index(canvas_helper, self.scale_points, x, y, threshold)
 
     def on_canvas_click(self, event):
         if self.image is None:
@@ -1619,9 +1694,8 @@ class DewarpGUI:
                 self.transform_btn.config(state=tk.NORMAL)
                 if self.layout_mode == "tabbed":
                     self.tab_transform_btn.config(state=tk.NORMAL)
-                # Auto-apply transform when 4th point is placed
+                # Auto-apply transform when 4th point is placed (it reports its own status)
                 self.apply_transform()
-                self.status_label.config(text="Transform applied. Adjust points if needed.")
             else:
                 labels = ["top-left", "top-right", "bottom-right", "bottom-left"]
                 self.status_label.config(text=f"Point {len(self.points)}/4 added. Suggest: {labels[len(self.points)]}")
@@ -1644,23 +1718,21 @@ class DewarpGUI:
             # Allow points beyond image boundaries (no clamping)
             self.points[self.dragging_point] = (x, y)
 
-            # Display on both canvases to keep them in sync
-            self.display_on_canvas()
-            self.display_on_tab_canvas()
+            # Display on both canvases to keep them in sync, with a live preview of the result
+            self._request_redraw("canvas", "tab_canvas", "preview")
         elif self.dragging_scale_point is not None and self.scale_mode == "original":
             # Update scale point position
             x, y = canvas_helper.canvas_to_image_coords(event.x, event.y)
             self.scale_points[self.dragging_scale_point] = (x, y)
 
             # Display on both canvases to keep them in sync
-            self.display_on_canvas()
-            self.display_on_tab_canvas()
+            self._request_redraw("canvas", "tab_canvas")
         elif canvas_helper.update_pan(event.x, event.y):
             # Pan the image on the active canvas only
             if self.layout_mode == "side-by-side":
-                self.display_on_canvas()
+                self._request_redraw("canvas")
             else:
-                self.display_on_tab_canvas()
+                self._request_redraw("tab_canvas")
 
     def on_canvas_release(self, event):
         # Use appropriate canvas based on layout mode
@@ -1671,6 +1743,8 @@ class DewarpGUI:
             self.dragging_point = None
             self.drag_start = None
             canvas_widget.config(cursor="cross")
+            # The full transform below replaces any preview still waiting to be drawn
+            self._dirty.discard("preview")
             # Recalculate dimensions and auto-apply after dragging a point
             if len(self.points) == 4:
                 self.calculate_output_dimensions()
@@ -1687,7 +1761,7 @@ class DewarpGUI:
         self.transformed_image = None
         self.transform_btn.config(state=tk.DISABLED)
         self.file_menu.entryconfig("Save Result...", state=tk.DISABLED)
-        self.result_canvas.delete("all")
+        self.right_canvas.clear()
 
         # Clear dimension fields and reset manual flag
         self._updating_dimensions = True
@@ -1701,13 +1775,56 @@ class DewarpGUI:
             self.status_label.config(text="Points reset. Click 4 corner points to begin.")
 
     def auto_detect_corners(self, show_debug=False):
-        """Automatically detect document corners using edge and contour detection"""
+        """Automatically detect document corners using edge and contour detection
+
+        Detection runs on a worker thread; the corners are installed by
+        _poll_detect once it finishes.
+        """
         if self.image is None:
             self.status_label.config(text="Please load an image first")
             return
 
-        # Use CornerDetector to find corners
-        detected_points = self.corner_detector.detect(self.image)
+        self._detect_generation += 1
+        self.status_label.config(text="Detecting corners...")
+        future = self._detect_executor.submit(self._detect_job, self.image, show_debug)
+        self.root.after(self.DETECT_POLL_MS, self._poll_detect, self._detect_generation, future,
+                        self.image, list(self.points))
+
+    def _detect_job(self, image, show_debug):
+        """
+        Detect corners on the worker thread
+
+        The debug visualization is built here too, so the detector (and its
+        cached grayscale image) is only ever used from this thread.
+
+        Args:
+            image: RGB image to search
+            show_debug: Also build the debug visualization
+
+        Returns:
+            tuple: (detected points or None, (debug image, info dict) or None)
+        """
+        detected_points = self.corner_detector.detect(image)
+        debug = self.corner_detector.create_debug_visualization(image) if show_debug else None
+        return detected_points, debug
+
+    def _poll_detect(self, generation, future, source_image, points_before):
+        """Install finished background corner detection, or check again shortly"""
+        # Drop results for a replaced image or points the user has since edited
+        if (generation != self._detect_generation or source_image is not self.image
+                or self.points != points_before):
+            return
+        if not future.done():
+            self.root.after(self.DETECT_POLL_MS, self._poll_detect, generation, future,
+                            source_image, points_before)
+            return
+
+        try:
+            detected_points, debug = future.result()
+        except Exception as e:
+            logging.error(f"Corner detection failed: {str(e)}")
+            self.status_label.config(text=f"Error: Corner detection failed - {e}")
+            return
 
         if detected_points is not None:
             # Set the detected points
@@ -1722,28 +1839,26 @@ class DewarpGUI:
             self.transform_btn.config(state=tk.NORMAL)
             self.tab_transform_btn.config(state=tk.NORMAL)
 
-            # Auto-apply transform after auto-detection
+            # Auto-apply transform after auto-detection (it reports its own status)
             self.apply_transform()
-            self.status_label.config(text="Auto-detected 4 corners and applied transform. Adjust points if needed.")
 
             # Show debug window if enabled
-            if show_debug:
-                self._show_detection_debug()
+            if debug is not None:
+                self._show_detection_debug(*debug)
         else:
             self.status_label.config(text="Could not detect document corners. Try manual selection.")
 
             # Show debug window to help diagnose
-            if show_debug:
-                self._show_detection_debug()
+            if debug is not None:
+                self._show_detection_debug(*debug)
 
-    def _show_detection_debug(self):
-        """Show debug window with edge detection and contour analysis"""
-        if self.image is None:
-            return
-
-        # Use CornerDetector to create debug visualization
-        combined, info_dict = self.corner_detector.create_debug_visualization(self.image)
+    def _show_detection_debug(self, combined, info_dict):
+        """Show debug window with edge detection and contour analysis
 
+        Args:
+            combined: Debug image from CornerDetector.create_debug_visualization
+            info_dict: Detection metadata from the same call
+        """
         # Create popup window
         debug_window = tk.Toplevel(self.root)
         debug_window.title("Corner Detection Debug")
@@ -1765,6 +1880,64 @@ class DewarpGUI:
         """Order points as: top-left, top-right, bottom-right, bottom-left"""
         return self.corner_detector.order_points(pts)
 
+    @staticmethod
+    def _solve_homography(src, dst):
+        """
+        Solve the perspective transform mapping four src points onto four dst points
+
+        Builds the same 8x8 linear system as cv2.getPerspectiveTransform (with
+        M[2, 2] fixed at 1) and solves it directly with NumPy.
+
+        Args:
+            src: (4, 2) source points
+            dst: (4, 2) destination points
+
+        Returns:
+            3x3 float64 transform matrix
+
+        Raises:
+            numpy.linalg.LinAlgError: if three of the points are collinear
+        """
+        src = np.asarray(src, dtype=np.float64)
+        dst = np.asarray(dst, dtype=np.float64)
+        x, y = src[:, 0], src[:, 1]
+        u, v = dst[:, 0], dst[:, 1]
+
+        A = np.zeros((8, 8))
+        A[0::2, 0] = x
+        A[0::2, 1] = y
+        A[0::2, 2] = 1.0
+        A[0::2, 6] = -x * u
+        A[0::2, 7] = -y * u
+        A[1::2, 3] = x
+        A[1::2, 4] = y
+        A[1::2, 5] = 1.0
+        A[1::2, 6] = -x * v
+        A[1::2, 7] = -y * v
+
+        h = np.linalg.solve(A, dst.reshape(-1))
+        return np.append(h, 1.0).reshape(3, 3)
+
+    @staticmethod
+    def _is_degenerate_quad(rect, min_sine=1e-3):
+        """
+        Check whether ordered corners fail to form a usable quadrilateral
+
+        Args:
+            rect: (4, 2) corners ordered top-left, top-right, bottom-right, bottom-left
+            min_sine: smallest allowed |sin| of the angle at any corner
+
+        Returns:
+            bool: True if two corners coincide or three are (nearly) collinear
+        """
+        rect = np.asarray(rect, dtype=np.float64)
+        # Edge arriving at and edge leaving each corner
+        edges_in = rect - np.roll(rect, 1, axis=0)
+        edges_out = np.roll(rect, -1, axis=0) - rect
+        cross = edges_in[:, 0] * edges_out[:, 1] - edges_in[:, 1] * edges_out[:, 0]
+        lengths = np.hypot(edges_in[:, 0], edges_in[:, 1])
+        return bool(np.any(np.abs(cross) <= min_sine * lengths * np.roll(lengths, -1)))
+
     def calculate_output_dimensions(self):
         """Calculate output dimensions based on the distances between selected points"""
         if len(self.points) != 4:
@@ -1775,14 +1948,14 @@ class DewarpGUI:
             return
 
         # Order the points
-        rect = self.order_points(self.points)
+        rect = self.order_points(self.points).tolist()
         (tl, tr, br, bl) = rect
 
         # Calculate distances between points (in pixels)
-        top_width = np.sqrt(((tr[0] - tl[0]) ** 2) + ((tr[1] - tl[1]) ** 2))
-        bottom_width = np.sqrt(((br[0] - bl[0]) ** 2) + ((br[1] - bl[1]) ** 2))
-        left_height = np.sqrt(((bl[0] - tl[0]) ** 2) + ((bl[1] - tl[1]) ** 2))
-        right_height = np.sqrt(((br[0] - tr[0]) ** 2) + ((br[1] - tr[1]) ** 2))
+        top_width = math.hypot(tr[0] - tl[0], tr[1] - tl[1])
+        bottom_width = math.hypot(br[0] - bl[0], br[1] - bl[1])
+        left_height = math.hypot(bl[0] - tl[0], bl[1] - tl[1])
+        right_height = math.hypot(br[0] - tr[0], br[1] - tr[1])
 
         # Average the opposing sides
         avg_width_pixels = (top_width + bottom_width) / 2.0
@@ -1795,14 +1968,15 @@ class DewarpGUI:
             width_value = avg_width_pixels / self.scale_factor
             height_value = avg_height_pixels / self.scale_factor
         else:
-            # Use input image DPI for conversion
-            width_value = self.pixels_to_units(avg_width_pixels, dpi=self.input_dpi)
-            height_value = self.pixels_to_units(avg_height_pixels, dpi=self.input_dpi)
+            # Use input image DPI for conversion, measured in full resolution pixels
+            # (the points are on the working copy, which may be downscaled)
+            width_value = self.pixels_to_units(avg_width_pixels / self._source_scale, dpi=self.input_dpi)
+            height_value = self.pixels_to_units(avg_height_pixels / self._source_scale, dpi=self.input_dpi)
 
         # Update the dimension fields
         # Set flag to prevent triggering the manual edit callback
         self._updating_dimensions = True
-        if self.units.get() == "pixels":
+        if self._units_str == "pixels":
             # Pixels - show as integer
             self.width_var.set(str(int(round(width_value))))
             self.height_var.set(str(int(round(height_value))))
@@ -1812,40 +1986,42 @@ class DewarpGUI:
             self.height_var.set(f"{height_value:.1f}")
         self._updating_dimensions = False
 
-    def apply_transform(self):
-        if len(self.points) != 4:
-            self.status_label.config(text="Please select exactly 4 points")
-            return
-
+    def _compute_transform(self):
+        """
+        Compute the perspective transform for the current points and dimensions
+
+        The points are in working copy coordinates and the output size is the
+        full resolution output, so M maps the working copy straight onto the
+        full size result (_ensure_full_res_result rescales it for original_full).
+
+        Returns:
+            tuple: (M, output_width, output_height, status), or None if the
+                   dimension fields are invalid or the corners are degenerate
+                   (see _is_degenerate_quad). status holds the values for
+                   _format_transform_status, so the message is only built
+                   when it is shown.
+        """
         # Order the points
         rect = self.order_points(self.points)
-        (tl, tr, br, bl) = rect
+        if self._is_degenerate_quad(rect):
+            return None
 
         # Get DPI
+        dpi = self._dpi_int
+
+        # Get dimensions from spinbox (user's real-world measurements)
         try:
-            dpi = int(self.dpi_var.get())
+            width_value = float(self.width_var.get())
+            height_value = float(self.height_var.get())
         except ValueError:
-            dpi = 300
+            return None
 
-        # Check crop mode
-        crop_enabled = self.crop_image.get()
+        # Get units abbreviation for display
+        units_abbr = "px" if self._units_str == "pixels" else ("in" if self._units_str == "inches" else "mm")
 
-        # Log transform parameters
-        width_val = self.width_var.get()
-        height_val = self.height_var.get()
-        units = self.units.get()
-        logging.info(f"Transform: points={self.points}, width={width_val}, height={height_val}, units={units}, dpi={dpi}, crop={crop_enabled}")
-        if not crop_enabled:
+        if not self.crop_image.get():
             # Transform entire image mode (crop unchecked)
 
-            # Get dimensions from spinbox (user's real-world measurements)
-            try:
-                width_value = float(self.width_var.get())
-                height_value = float(self.height_var.get())
-            except ValueError:
-                self.status_label.config(text="Invalid dimensions")
-                return
-
             # Convert to pixels for the quadrilateral
             quad_width = self.units_to_pixels(width_value)
             quad_height = self.units_to_pixels(height_value)
@@ -1861,23 +2037,25 @@ class DewarpGUI:
                 [quad_width - 1, quad_height - 1],
                 [0, quad_height - 1]], dtype="float32")
 
-            M_temp = cv2.getPerspectiveTransform(rect, temp_dst)
+            try:
+                M_temp = self._solve_homography(rect, temp_dst)
+            except np.linalg.LinAlgError:
+                return None
 
-            # Transform the four corners of the original image to see the bounding box
+            # Transform the four corners of the original image (homogeneous columns) to see the bounding box
             img_corners = np.array([
-                [0, 0],
-                [img_width - 1, 0],
-                [img_width - 1, img_height - 1],
-                [0, img_height - 1]], dtype="float32")
-
-            # Apply transform to each corner
-            transformed_corners = cv2.perspectiveTransform(img_corners.reshape(-1, 1, 2), M_temp).reshape(-1, 2)
-
-            # Find bounding box of transformed image
-            min_x = int(np.floor(transformed_corners[:, 0].min()))
-            max_x = int(np.ceil(transformed_corners[:, 0].max()))
-            min_y = int(np.floor(transformed_corners[:, 1].min()))
-            max_y = int(np.ceil(transformed_corners[:, 1].max()))
+                [0, img_width - 1, img_width - 1, 0],
+                [0, 0, img_height - 1, img_height - 1],
+                [1, 1, 1, 1]], dtype=np.float64)
+            h = M_temp @ img_corners
+            xs = (h[0] / h[2]).tolist()
+            ys = (h[1] / h[2]).tolist()
+
+            # Find bounding box of transformed image (plain floats; only four values)
+            min_x = math.floor(min(xs))
+            max_x = math.ceil(max(xs))
+            min_y = math.floor(min(ys))
+            max_y = math.ceil(max(ys))
 
             # Calculate output canvas size
             output_width = max_x - min_x
@@ -1888,37 +2066,17 @@ class DewarpGUI:
             offset_x = -min_x
             offset_y = -min_y
 
-            dst = np.array([
-                [offset_x, offset_y],
-                [offset_x + quad_width - 1, offset_y],
-                [offset_x + quad_width - 1, offset_y + quad_height - 1],
-                [offset_x, offset_y + quad_height - 1]], dtype="float32")
-
-            # Compute final perspective transform
-            M = cv2.getPerspectiveTransform(rect, dst)
-
-            # Convert to BGR for warpPerspective, then back to RGB
-            original_bgr = cv2.cvtColor(self.original_image, cv2.COLOR_RGB2BGR)
-            transformed_bgr = cv2.warpPerspective(original_bgr, M, (output_width, output_height))
-            self.transformed_image = cv2.cvtColor(transformed_bgr, cv2.COLOR_BGR2RGB)
+            # Shifting the destination is a translation applied after M_temp
+            T = np.array([
+                [1, 0, offset_x],
+                [0, 1, offset_y],
+                [0, 0, 1]], dtype=np.float64)
+            M = T @ M_temp
 
-            # Calculate output dimensions in mm
-            output_width_mm = (output_width / dpi) * 25.4
-            output_height_mm = (output_height / dpi) * 25.4
-
-            # Get units abbreviation for display
-            units_abbr = "px" if self.units.get() == "pixels" else ("in" if self.units.get() == "inches" else "mm")
-            status_msg = f"Transform applied! Output: {output_width_mm:.0f}x{output_height_mm:.0f}mm @ {dpi}DPI ({output_width}x{output_height}px) [Full image, quad={width_value:.1f}x{height_value:.1f}{units_abbr}]"
+            # Output dimensions in mm are worked out when the status is formatted
+            status = ("full", output_width, output_height, dpi, width_value, height_value, units_abbr)
         else:
             # Crop to selected region mode (original behavior)
-            # Get dimensions in current units and convert to pixels
-            try:
-                width_value = float(self.width_var.get())
-                height_value = float(self.height_var.get())
-            except ValueError:
-                self.status_label.config(text="Invalid dimensions")
-                return
-
             # Convert to pixels
             output_width = self.units_to_pixels(width_value)
             output_height = self.units_to_pixels(height_value)
@@ -1931,17 +2089,151 @@ class DewarpGUI:
                 [0, output_height - 1]], dtype="float32")
 
             # Compute perspective transform
-            M = cv2.getPerspectiveTransform(rect, dst)
+            try:
+                M = self._solve_homography(rect, dst)
+            except np.linalg.LinAlgError:
+                return None
+
+            status = ("crop", output_width, output_height, dpi, width_value, height_value, units_abbr)
+
+        return M, output_width, output_height, status
+
+    def apply_transform(self):
+        # Any scheduled transform is superseded by this one
+        if self._pending_after is not None:
+            self.root.after_cancel(self._pending_after)
+            self._pending_after = None
+
+        if len(self.points) != 4:
+            self.status_label.config(text="Please select exactly 4 points")
+            return
+
+        # Log transform parameters
+        logging.info("Transform: points=%s, width=%s, height=%s, units=%s, dpi=%s, crop=%s", self.points,
+                     self.width_var.get(), self.height_var.get(), self._units_str, self._dpi_int, self.crop_image.get())
+
+        # Everything the transform depends on; the cache is cleared when the original changes
+        key = (self.order_points(self.points).tobytes(), self.width_var.get(), self.height_var.get(),
+               self._units_str, self._dpi_int, self.crop_image.get(), self.original_image.shape)
+
+        # Entries are [M_inv, output_width, output_height, status, maps]; maps holds the
+        # remap tables for the last warp size, filled in once the first warp finishes
+        entry = self._warp_cache.get(key)
+        if entry is not None:
+            self._warp_cache.move_to_end(key)
+            M_inv, output_width, output_height, status, maps = entry
+        else:
+            transform = self._compute_transform()
+            if transform is None:
+                if self._is_degenerate_quad(self.order_points(self.points)):
+                    self.status_label.config(text="Corners do not form a quadrilateral - "
+                                                  "move them so no three are in a line")
+                else:
+                    self.status_label.config(text="Invalid dimensions")
+                return
+            M, output_width, output_height, status = transform
+
+            # Invert once here so the warp can skip OpenCV's internal inversion
+            M_inv = cv2.invert(M)[1]
+
+            maps = None
+            entry = [M_inv, output_width, output_height, status, maps]
+            self._warp_cache[key] = entry
+            if len(self._warp_cache) > self.WARP_CACHE_SIZE:
+                self._warp_cache.popitem(last=False)
+
+        img_height, img_width = self.original_image.shape[:2]
+        if ((output_width, output_height) == (img_width, img_height)
+                and np.allclose(M_inv, np.eye(3), atol=1e-6)):
+            # Identity transform: the result is the original (result edits never modify it in place)
+            self._warp_generation += 1
+            self._result_full_res = (M_inv, output_width, output_height) if self.original_full is not None else None
+            self.transformed_image = self.original_image
+            self._show_transform_result(status)
+            return
+
+        # Only warp as many pixels as the result canvas can show; full resolution
+        # is rendered on demand by _ensure_full_res_result
+        preview_scale = self._result_preview_scale(output_width, output_height)
+
+        # The bilinear warp is a preview; the final result is rendered on demand
+        # (from original_full when working on a downscaled copy)
+        full_res = (M_inv, output_width, output_height)
+
+        if preview_scale < 1.0:
+            warp_M_inv = M_inv @ np.diag([1.0 / preview_scale, 1.0 / preview_scale, 1.0])
+            warp_width = max(1, int(output_width * preview_scale))
+            warp_height = max(1, int(output_height * preview_scale))
+        else:
+            warp_M_inv, warp_width, warp_height = M_inv, output_width, output_height
+
+        # Reuse this geometry's remap tables if they were built for the same output size
+        warp_size = (warp_width, warp_height)
+        if maps is not None and maps[0] != warp_size:
+            maps = None
+
+        # The RGB image is resampled as-is (each channel independently). The warp runs on
+        # the worker thread (OpenCV releases the GIL); the result is picked up by _poll_warp.
+        # Each result is a fresh array: the result canvases may still be resampling earlier
+        # ones on their own workers, so no result buffer is ever written again
+        self._warp_generation += 1
+        future = self._warp_executor.submit(self._warp_job, self.original_image, warp_M_inv,
+                                            warp_size, maps)
+
+        # The result on screen is now stale: don't render or save it at full resolution
+        self._result_full_res = None
+        self.file_menu.entryconfig("Save Result...", state=tk.DISABLED)
+        self.status_label.config(text="Applying transform...")
+        self.root.after(self.WARP_POLL_MS, self._poll_warp, self._warp_generation, future,
+                        self.original_image, full_res, entry)
+
+    def _warp_job(self, source, M_inv, size, maps):
+        """
+        Warp source into a new array on the worker thread
+
+        Args:
+            source: image to warp
+            M_inv: 3x3 matrix mapping output pixels to source pixels
+            size: output size as (width, height)
+            maps: (size, map1, map2) remap tables from an earlier warp, or None
+
+        Returns:
+            tuple: (warped image, remap tables to keep for next time or None)
+        """
+        if self.warper.on_gpu:
+            return self.warper.warp(source, M_inv, size, cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP), None
+
+        # Repeat applies of the same geometry only pay for the resample
+        if maps is None:
+            maps = (size,) + self.warper.build_maps(M_inv, size)
+        return self.warper.remap(source, maps[1], maps[2]), maps
+
+    def _poll_warp(self, generation, future, source_image, full_res, entry):
+        """Show a finished background warp unless a newer result has replaced it"""
+        if generation != self._warp_generation or source_image is not self.original_image:
+            return
+
+        if not future.done():
+            self.root.after(self.WARP_POLL_MS, self._poll_warp, generation, future,
+                            source_image, full_res, entry)
+            return
+
+        try:
+            self.transformed_image, entry[4] = future.result()
+        except Exception as e:
+            logging.error(f"Transform failed: {str(e)}")
+            self.status_label.config(text=f"Error: Transform failed - {e}")
+            return
 
-            # Convert to BGR for warpPerspective, then back to RGB
-            original_bgr = cv2.cvtColor(self.original_image, cv2.COLOR_RGB2BGR)
-            transformed_bgr = cv2.warpPerspective(original_bgr, M, (output_width, output_height))
-            self.transformed_image = cv2.cvtColor(transformed_bgr, cv2.COLOR_BGR2RGB)
+        self._result_full_res = full_res
+        self._show_transform_result(entry[3])
 
-            # Get units abbreviation for display
-            units_abbr = "px" if self.units.get() == "pixels" else ("in" if self.units.get() == "inches" else "mm")
-            status_msg = f"Transform applied! Output: {width_value:.1f}x{height_value:.1f}{units_abbr} @ {dpi}DPI ({output_width}x{output_height}px)"
+    def _show_transform_result(self, status):
+        """Display a freshly computed transformed_image on both result canvases
 
+        Args:
+            status: status values from _compute_transform
+        """
         # Reset zoom and pan for new result (both canvases)
         self.right_canvas.reset_view()
         self.tab_right_canvas.reset_view()
@@ -1949,38 +2241,163 @@ class DewarpGUI:
         # Display result on both canvases
         self.display_result()
         self.display_on_tab_result()
-        self.status_label.config(text=status_msg)
+        self.status_label.config(text=self._format_transform_status(status))
         self.file_menu.entryconfig("Save Result...", state=tk.NORMAL)
 
+    @staticmethod
+    def _format_transform_status(status):
+        """Build the status bar message for a finished transform"""
+        mode, output_width, output_height, dpi, width_value, height_value, units_abbr = status
+        if mode == "full":
+            # Calculate output dimensions in mm
+            output_width_mm = (output_width / dpi) * 25.4
+            output_height_mm = (output_height / dpi) * 25.4
+            return f"Transform applied! Output: {output_width_mm:.0f}x{output_height_mm:.0f}mm @ {dpi}DPI ({output_width}x{output_height}px) [Full image, quad={width_value:.1f}x{height_value:.1f}{units_abbr}]"
+        return f"Transform applied! Output: {width_value:.1f}x{height_value:.1f}{units_abbr} @ {dpi}DPI ({output_width}x{output_height}px)"
+
+    def _ensure_full_res_result(self, on_ready=None, exact=False, wait=False):
+        """Replace a preview result with the full resolution, full quality warp
+
+        Called before anything that needs real result pixels: saving, zooming in,
+        calibrating on the result, and editing or reusing it. Warps from
+        original_full when the original is a downscaled working copy, with
+        RESULT_INTERPOLATION instead of the bilinear preview sampling.
+
+        Only saving renders on the Tk thread; otherwise the render runs on the
+        warp worker and the result canvases are redrawn when it lands.
+
+        Args:
+            on_ready: called once the render lands, if it was not ready now
+            exact: the caller needs the final pixels, not just the final geometry
+            wait: render synchronously (for saving)
+
+        Returns:
+            bool: True if transformed_image can be used right away
+        """
+        if self._result_full_res is None or self.transformed_image is None:
+            return True
+
+        M_inv, output_width, output_height = self._result_full_res
+        if (not exact and not wait and self.original_full is None
+                and self.transformed_image.shape[:2] == (output_height, output_width)):
+            # Same pixels and source as the final render; only the sampling differs
+            return True
+
+        source = self.original_image
+        if self.original_full is not None:
+            # M_inv maps into working copy coordinates; scale those up to the full image
+            source = self.original_full
+            M_inv = np.diag([1.0 / self._source_scale, 1.0 / self._source_scale, 1.0]) @ M_inv
+        size = (output_width, output_height)
+        flags = self.RESULT_INTERPOLATION | cv2.WARP_INVERSE_MAP
+
+        if wait:
+            logging.info(f"Rendering full resolution result ({output_width}x{output_height}px)")
+            self._result_full_res = None
+            self.transformed_image = self.warper.warp(source, M_inv, size, flags=flags)
+            return True
+
+        job = self._full_res_job
+        if job is None or job[0] != self._warp_generation:
+            logging.info(f"Rendering full resolution result ({output_width}x{output_height}px) in the background")
+            future = self._warp_executor.submit(self.warper.warp, source, M_inv, size, flags)
+            job = self._full_res_job = (self._warp_generation, future, [])
+            self.root.after(self.WARP_POLL_MS, self._poll_full_res, job)
+        if on_ready is not None:
+            job[2].append(on_ready)
+        return False
+
+    def _poll_full_res(self, job):
+        """Install a finished full resolution render unless the result has changed since"""
+        if job is not self._full_res_job:
+            return  # Superseded by a render for a newer result
+        generation, future, callbacks = job
+        if not future.done():
+            self.root.after(self.WARP_POLL_MS, self._poll_full_res, job)
+            return
+
+        self._full_res_job = None
+        if generation != self._warp_generation:
+            return
+
+        try:
+            image = future.result()
+        except Exception as e:
+            logging.error(f"Full resolution render failed: {str(e)}")
+            self.status_label.config(text=f"Error: Full resolution render failed - {e}")
+            return
+
+        # Saving may already have rendered it on the Tk thread
+        if self._result_full_res is not None:
+            self._result_full_res = None
+            self.transformed_image = image
+            self.display_result()
+            self.display_on_tab_result()
+
+        for callback in callbacks:
+            callback()
+
+    def _result_preview_scale(self, output_width, output_height):
+        """
+        Scale at which to render a preview of the result
+
+        Args:
+            output_width, output_height: full resolution result size
+
+        Returns:
+            float: 1.0, or less when the result is bigger than the result canvases
+                   (calibrating on the result always needs full resolution)
+        """
+        if not self._preview_mode or self.scale_mode == "result":
+            return 1.0
+        canvas_max = max(self.right_canvas.canvas_width, self.right_canvas.canvas_height,
+                         self.tab_right_canvas.canvas_width, self.tab_right_canvas.canvas_height)
+        return min(1.0, canvas_max / max(output_width, output_height))
+
+    def apply_transform_preview(self):
+        """Quick transform while a corner is being dragged
+
+        Uses nearest-neighbour sampling at result canvas resolution into a
+        reusable buffer; the full-quality transform runs when the point is
+        released.
+        """
+        if len(self.points) != 4 or self.original_image is None:
+            return
+
+        transform = self._compute_transform()
+        if transform is None:
+            return
+        M, output_width, output_height, _ = transform
+
+        # Only warp as many pixels as the result canvas can show
+        preview_scale = self._result_preview_scale(output_width, output_height)
+        warp_M = np.diag([preview_scale, preview_scale, 1.0]) @ M
+        warp_width = max(1, int(output_width * preview_scale))
+        warp_height = max(1, int(output_height * preview_scale))
+
+        # Reallocate the warp buffer only when the preview size changes
+        if self._preview_dst is None or self._preview_dst.shape[:2] != (warp_height, warp_width):
+            self._preview_dst = np.empty((warp_height, warp_width, 3), dtype=np.uint8)
+
+        self._warp_generation += 1
+        preview = self.warper.warp(self.original_image, warp_M, (warp_width, warp_height),
+                                   flags=cv2.INTER_NEAREST, dst=self._preview_dst)
+        # The canvases resize transformed_image on their worker threads, so the next
+        # drag frame must not rewrite it in place: publish a copy of the warp buffer
+        self.transformed_image = preview.copy()
+        self._result_full_res = (cv2.invert(M)[1], output_width, output_height)
+
+        # Keep the current result view while dragging
+        self.display_result()
+        self.display_on_tab_result()
+
     def display_result(self):
         if self.transformed_image is None:
             return
 
-        # Define overlay callback to draw scale line if in result scale mode
-        def draw_scale_overlay(canvas_image, effective_scale, pan_offset):
-            if self.scale_mode == "result" and len(self.scale_points) > 0:
-                # Draw line first if we have 2 points
-                if len(self.scale_points) == 2:
-                    pt1_x, pt1_y = self.right_canvas.image_to_canvas_coords(
-                        self.scale_points[0][0], self.scale_points[0][1])
-                    pt2_x, pt2_y = self.right_canvas.image_to_canvas_coords(
-                        self.scale_points[1][0], self.scale_points[1][1])
-                    # Draw thin cyan line
-                    cv3.line(canvas_image, int(pt1_x), int(pt1_y),
-                            int(pt2_x), int(pt2_y), color=(0, 255, 255), t=1)
-
-                # Draw endpoints on top with smaller circles
-                for i, pt in enumerate(self.scale_points):
-                    pt_x, pt_y = self.right_canvas.image_to_canvas_coords(pt[0], pt[1])
-                    pt_x, pt_y = int(pt_x), int(pt_y)
-                    # Outer circle (cyan)
-                    cv3.circle(canvas_image, pt_x, pt_y, 5, color=(0, 255, 255), t=1)
-                    # Inner filled circle (cyan)
-                    cv3.circle(canvas_image, pt_x, pt_y, 3, color=(0, 255, 255), fill=True)
-
         # Display result image using right_canvas ImageCanvas helper
-        overlay_callback = draw_scale_overlay if self.scale_mode == "result" else None
-        self.right_canvas.display_image(self.transformed_image, overlay_callback=overlay_callback)
+        self._update_scale_overlay(self.right_canvas)
+        self.right_canvas.display_image(self.transformed_image)
         self.result_update_zoom_display()
 
     def on_result_mouse_wheel(self, event):
@@ -2119,11 +2536,10 @@ class DewarpGUI:
         )
 
         if file_path:
+            self._ensure_full_res_result(wait=True)
+
             # Get output DPI - if scale calibration is active, calculate actual DPI
-            try:
-                dpi = int(self.dpi_var.get())
-            except ValueError:
-                dpi = 300
+            dpi = self._dpi_int
 
             # If scale was calibrated, calculate the actual DPI to write to file
             if self.scale_calibrator.is_calibrated():
@@ -2134,7 +2550,7 @@ class DewarpGUI:
                 try:
                     width_value = float(self.width_var.get())
                     height_value = float(self.height_var.get())
-                    current_units = self.units.get()
+                    current_units = self._units_str
 
                     # Convert dimensions to inches for DPI calculation
                     if current_units == "inches":
@@ -6,10 +6,12 @@ from .unit_converter import UnitConverter
 from .image_canvas import ImageCanvas
 from .corner_detector import CornerDetector
 from .scale_calibrator import ScaleCalibrator
+from .perspective_warper import PerspectiveWarper
 
 __all__ = [
     'UnitConverter',
     'ImageCanvas',
     'CornerDetector',
     'ScaleCalibrator',
+    'PerspectiveWarper',
 ]
@@ -18,9 +18,45 @@ class CornerDetector:
     - Handles rounded corners and imperfect quadrilaterals
     """
 
+    # detect() works on a copy no larger than this (longest side, pixels);
+    # only rough quadrilateral geometry is needed
+    DETECT_MAX_SIZE = 1000
+
+    # Pre-Canny smoothing (cv2.GaussianBlur already filters separably in fixed point)
+    BLUR_KSIZE = (5, 5)
+
+    # Downscaling to this factor or below averages out pixel noise, so the blur is skipped
+    BLUR_SKIP_SCALE = 0.5
+
+    # Structuring element for closing small gaps in the edge map
+    DILATE_KERNEL = np.ones((3, 3), np.uint8)
+
+    # One dilation with this equals two with DILATE_KERNEL (used by the retry pass)
+    DILATE_KERNEL_WIDE = np.ones((5, 5), np.uint8)
+
+    # Only the largest contours are ever examined as document candidates
+    MAX_CANDIDATES = 20
+
     def __init__(self):
         """Initialize the corner detector"""
-        pass
+        # Grayscale copy of the last image seen, shared by detect() and the debug view
+        self._gray_source = None
+        self._gray = None
+
+    def _to_gray(self, image):
+        """
+        Convert an RGB image to grayscale, reusing the result for the same image.
+
+        Args:
+            image: numpy array in RGB format (not modified in place between calls)
+
+        Returns:
+            numpy array: Grayscale image
+        """
+        if image is not self._gray_source:
+            self._gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+            self._gray_source = image
+        return self._gray
 
     def detect(self, image):
         """
@@ -40,19 +76,29 @@ class CornerDetector:
         logging.info("Auto-detecting corners")
 
         try:
-            # Image dimensions
-            h, w = image.shape[:2]
-            image_area = h * w
-
             # Convert RGB to grayscale
-            gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
+            gray = self._to_gray(image)
+
+            # Run the edge/contour pipeline on a downscaled copy; corners are scaled back at the end
+            full_h, full_w = gray.shape[:2]
+            scale = min(1.0, self.DETECT_MAX_SIZE / max(full_h, full_w))
+            if scale < 1.0:
+                gray = cv2.resize(gray, (max(1, round(full_w * scale)), max(1, round(full_h * scale))),
+                                  interpolation=cv2.INTER_AREA)
 
-            # Apply Gaussian blur to reduce noise
-            blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+            # Image dimensions (of the detection copy)
+            h, w = gray.shape[:2]
+            image_area = h * w
+
+            # Apply Gaussian blur to reduce noise (unless the area downscale already did)
+            if scale > self.BLUR_SKIP_SCALE:
+                blurred = cv2.GaussianBlur(gray, self.BLUR_KSIZE, 0, borderType=cv2.BORDER_REPLICATE)
+            else:
+                blurred = gray
 
             # Apply Canny edge detection with improved adaptive thresholds
             # Use median-based thresholds, but with better handling for light/dark documents
-            median = np.median(blurred)
+            median = self._median_u8(blurred)
 
             # For dark backgrounds (median < 100), use fixed thresholds that work better
             # For light backgrounds, use adaptive thresholds
@@ -68,32 +114,38 @@ class CornerDetector:
             edges = cv2.Canny(blurred, lower, upper, apertureSize=3)
 
             # Dilate edges slightly to close small gaps
-            kernel = np.ones((3, 3), np.uint8)
-            edges = cv2.dilate(edges, kernel, iterations=1)
+            edges = self._dilate(edges, self.DILATE_KERNEL)
 
-            # Find contours
-            contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+            # Find all contours, nested ones included - the page may sit inside a
+            # closed outer edge loop (scanner lid, mat, larger sheet)
+            contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_TC89_KCOS)
 
             # If very few edge pixels, try with more aggressive edge detection
             edge_pixel_ratio = np.count_nonzero(edges) / image_area
             if edge_pixel_ratio < 0.05 and len(contours) < 10:
                 # Try again with different parameters
                 edges2 = cv2.Canny(blurred, 30, 100, apertureSize=5)
-                edges2 = cv2.dilate(edges2, kernel, iterations=2)
-                contours2, _ = cv2.findContours(edges2, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
+                edges2 = self._dilate(edges2, self.DILATE_KERNEL_WIDE)
+                contours2, _ = cv2.findContours(edges2, cv2.RETR_LIST, cv2.CHAIN_APPROX_TC89_KCOS)
                 if len(contours2) > len(contours):
                     contours = contours2
                     edges = edges2
 
-            # Sort contours by area (largest first)
-            contours = sorted(contours, key=cv2.contourArea, reverse=True)
+            # Keep the largest contours with their areas (largest first); each
+            # area is computed once and reused by both passes below
+            candidates = self._largest_contours(contours, self.MAX_CANDIDATES)
 
             # Find the largest quadrilateral contour
             # Simple approach: find biggest 4-sided shape that isn't the image boundary
             document_contour = None
             border_threshold = min(h, w) * 0.02  # 2% of smaller dimension
 
-            for contour in contours[:20]:  # Check top 20 largest contours
+            for contour, contour_area in candidates:  # Check the largest candidates
+                # Contours are sorted by area, so once one is too small to hold a
+                # substantial quad, none of the rest can either
+                if contour_area <= 0.05 * image_area:
+                    break
+
                 peri = cv2.arcLength(contour, True)
 
                 # Try different epsilon values to get 4 vertices
@@ -133,9 +185,8 @@ class CornerDetector:
             # If no 4-sided contour found, try to detect document touching edges
             if document_contour is None:
                 # Look for largest contour that might be partially off-screen
-                for contour in contours[:10]:
-                    area = cv2.contourArea(contour)
-                    if area > 0.20 * image_area:  # Must be substantial
+                for contour, contour_area in candidates[:10]:
+                    if contour_area > 0.20 * image_area:  # Must be substantial
                         peri = cv2.arcLength(contour, True)
                         approx = cv2.approxPolyDP(contour, 0.02 * peri, True)
 
@@ -161,20 +212,16 @@ class CornerDetector:
                                     break
 
             if document_contour is not None:
-                # Extract corner points
-                if len(document_contour) == 4:
-                    corners = document_contour.reshape(4, 2).astype(float)
-                else:
-                    corners = document_contour
+                # Extract corner points (both passes yield a 4x1x2 int array)
+                corners = document_contour.reshape(4, 2).astype(np.float64)
 
-                # Convert to list of tuples
-                points = [(float(x), float(y)) for x, y in corners]
+                # Back to full resolution coordinates
+                if scale < 1.0:
+                    corners *= (full_w / w, full_h / h)
+                    np.clip(corners, 0, (full_w - 1, full_h - 1), out=corners)
 
-                # Order points properly
-                ordered = self.order_points(points)
-                points = [(float(x), float(y)) for x, y in ordered]
-
-                return points
+                # Order points properly and hand back plain (x, y) float tuples
+                return [tuple(pt) for pt in self.order_points(corners).tolist()]
             else:
                 return None
 
@@ -182,6 +229,49 @@ class CornerDetector:
             logging.error(f"Auto-detection failed: {str(e)}")
             return None
 
+    @staticmethod
+    def _median_u8(gray):
+        """
+        Median of a uint8 image from its 256-bin histogram (one linear pass, no sort).
+
+        Args:
+            gray: Single-channel uint8 image
+
+        Returns:
+            int: Median intensity (the lower middle value for an even pixel count)
+        """
+        hist = cv2.calcHist([gray], [0], None, [256], [0, 256]).ravel()
+        cumulative = np.cumsum(hist)
+        return int(np.searchsorted(cumulative, cumulative[-1] * 0.5))
+
+    @staticmethod
+    def _dilate(edges, kernel):
+        """Dilate an edge map once with kernel (pixels outside the image count as background)"""
+        return cv2.dilate(edges, kernel, borderType=cv2.BORDER_CONSTANT, borderValue=0)
+
+    @staticmethod
+    def _largest_contours(contours, count):
+        """
+        Pick the largest contours by area, computing each area only once.
+
+        Args:
+            contours: Sequence of contours from cv2.findContours
+            count: Maximum number of contours to keep
+
+        Returns:
+            list: (contour, area) pairs, largest area first
+        """
+        if not contours:
+            return []
+        areas = np.fromiter((cv2.contourArea(c) for c in contours),
+                            dtype=np.float64, count=len(contours))
+        if len(areas) > count:
+            top = np.argpartition(-areas, count - 1)[:count]
+        else:
+            top = np.arange(len(areas))
+        top = top[np.argsort(-areas[top], kind='stable')]
+        return [(contours[i], float(areas[i])) for i in top]
+
     def _supplement_with_corners(self, contour, width, height):
         """
         Supplement partial contour with image corner points.
@@ -200,22 +290,17 @@ class CornerDetector:
         points = contour.reshape(-1, 2)
         margin = 10
 
-        # Determine which corners are missing
+        # Determine which corners are present (all points classified at once)
+        x, y = points[:, 0], points[:, 1]
+        at_left, at_right = x < margin, x > width - margin
+        at_top, at_bottom = y < margin, y > height - margin
         corners_present = {
-            'tl': False, 'tr': False, 'bl': False, 'br': False
+            'tl': bool(np.any(at_left & at_top)),
+            'tr': bool(np.any(at_right & at_top)),
+            'bl': bool(np.any(at_left & at_bottom)),
+            'br': bool(np.any(at_right & at_bottom)),
         }
 
-        for pt in points:
-            x, y = pt
-            if x < margin and y < margin:
-                corners_present['tl'] = True
-            elif x > width - margin and y < margin:
-                corners_present['tr'] = True
-            elif x < margin and y > height - margin:
-                corners_present['bl'] = True
-            elif x > width - margin and y > height - margin:
-                corners_present['br'] = True
-
         # Add missing corners
         result_points = list(points)
 
@@ -246,20 +331,19 @@ class CornerDetector:
         """
         pts = np.array(pts, dtype="float32")
 
-        # Sort by y-coordinate (top to bottom)
-        sorted_by_y = pts[np.argsort(pts[:, 1])]
-
-        # Top two points
-        top_pts = sorted_by_y[:2]
-        top_pts = top_pts[np.argsort(top_pts[:, 0])]  # Sort by x
-        tl, tr = top_pts
+        # Top-left has the smallest x + y, bottom-right the largest; top-right has
+        # the smallest y - x, bottom-left the largest
+        s = pts.sum(axis=1)
+        d = pts[:, 1] - pts[:, 0]
+        idx = [int(s.argmin()), int(d.argmin()), int(s.argmax()), int(d.argmax())]
+        if len(set(idx)) == 4:
+            return pts[idx]
 
-        # Bottom two points
-        bottom_pts = sorted_by_y[2:]
-        bottom_pts = bottom_pts[np.argsort(bottom_pts[:, 0])]  # Sort by x
-        bl, br = bottom_pts
-
-        return np.array([tl, tr, br, bl], dtype="float32")
+        # Quads turned close to 45 degrees can pick one point twice; sort by angle
+        # around the centroid instead (clockwise on screen) and start at top-left
+        center = pts.mean(axis=0)
+        order = np.argsort(np.arctan2(pts[:, 1] - center[1], pts[:, 0] - center[0]))
+        return pts[np.roll(order, -int(s[order].argmin()))]
 
     def create_debug_visualization(self, image):
         """
@@ -276,11 +360,11 @@ class CornerDetector:
         image_area = h * w
 
         # Convert RGB to grayscale
-        gray = cv2.cvtColor(image, cv2.COLOR_RGB2GRAY)
-        blurred = cv2.GaussianBlur(gray, (5, 5), 0)
+        gray = self._to_gray(image)
+        blurred = cv2.GaussianBlur(gray, self.BLUR_KSIZE, 0, borderType=cv2.BORDER_REPLICATE)
 
         # Edge detection
-        median = np.median(blurred)
+        median = self._median_u8(blurred)
         if median < 100:
             lower, upper = 50, 150
         else:
@@ -288,25 +372,21 @@ class CornerDetector:
             upper = int(min(255, 1.33 * median))
 
         edges = cv2.Canny(blurred, lower, upper, apertureSize=3)
-        kernel = np.ones((3, 3), np.uint8)
-        edges = cv2.dilate(edges, kernel, iterations=1)
+        edges = self._dilate(edges, self.DILATE_KERNEL)
 
         # Find contours
-        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_SIMPLE)
-        contours = sorted(contours, key=cv2.contourArea, reverse=True)
-
-        # Convert edges to RGB for display
-        edges_rgb = cv2.cvtColor(edges, cv2.COLOR_GRAY2RGB)
+        contours, _ = cv2.findContours(edges, cv2.RETR_LIST, cv2.CHAIN_APPROX_TC89_KCOS)
+        num_contours = len(contours)
+        candidates = self._largest_contours(contours, 5)
 
         # Create contour visualization on original image
         contour_vis = image.copy()
 
         # Draw top 5 contours in different colors
         colors = [(255, 0, 0), (0, 255, 0), (0, 0, 255), (255, 255, 0), (255, 0, 255)]
-        for i, contour in enumerate(contours[:5]):
+        for i, (contour, area) in enumerate(candidates):
             cv2.drawContours(contour_vis, [contour], 0, colors[i], 2)
             # Label with contour number and area
-            area = cv2.contourArea(contour)
             M = cv2.moments(contour)
             if M["m00"] > 0:
                 cx = int(M["m10"] / M["m00"])
@@ -320,21 +400,23 @@ class CornerDetector:
         scale = min(max_debug_size / h, max_debug_size / w)
         new_h, new_w = int(h * scale), int(w * scale)
 
-        edges_small = cv2.resize(edges_rgb, (new_w, new_h))
+        # Shrink the single-channel edge map before expanding it to RGB for display
+        edges_small = cv2.resize(edges, (new_w, new_h))
+        edges_small = cv2.cvtColor(edges_small, cv2.COLOR_GRAY2RGB)
         contour_small = cv2.resize(contour_vis, (new_w, new_h))
 
         # Combine side by side
         combined = np.hstack([edges_small, contour_small])
 
         # Add info text
-        info_text = f"Median: {median:.0f} | Canny: {lower}-{upper} | Contours: {len(contours)}"
+        info_text = f"Median: {median:.0f} | Canny: {lower}-{upper} | Contours: {num_contours}"
         cv2.putText(combined, info_text, (10, 20), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (255, 255, 255), 1)
 
         info_dict = {
             'median': median,
             'canny_lower': lower,
             'canny_upper': upper,
-            'num_contours': len(contours),
+            'num_contours': num_contours,
             'width': new_w * 2,
             'height': new_h
         }
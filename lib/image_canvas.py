@@ -2,15 +2,40 @@
 ImageCanvas - Helper class for managing canvas zoom, pan, and display.
 """
 
+import math
 import tkinter as tk
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
-import cv3
+import cv2
 from PIL import Image, ImageTk
 
 
 class ImageCanvas:
     """Helper class to manage zoom, pan, and display for a canvas"""
 
+    # How often (ms) the Tk loop checks for a finished frame
+    FRAME_POLL_MS = 5
+
+    # Background shown around the image
+    FRAME_BG = '#404040'
+
+    # Overlay item colors
+    QUAD_COLOR = '#00ff00'
+    POINT_OUTER_COLOR = '#0000ff'
+    POINT_INNER_COLOR = '#ff0000'
+    SCALE_COLOR = '#00ffff'
+
+    # Outer ring and inner dot radius of point markers
+    MARKER_RADIUS = 5
+    MARKER_DOT_RADIUS = 3
+
+    # Smallest side of the coarsest pyramid level kept for static images
+    PYRAMID_MIN_SIZE = 128
+
+    # Zoom steps that land within this fraction of a power-of-two display scale
+    # (1/8 to 8) snap onto it, where a pyramid level is shown without resizing
+    ZOOM_SNAP_TOLERANCE = 0.05
+
     def __init__(self, canvas, canvas_width, canvas_height):
         self.canvas = canvas
         self.canvas_width = canvas_width
@@ -22,12 +47,65 @@ class ImageCanvas:
         self.base_scale_factor = 1.0
         self.needs_initial_center = False
 
+        # (image width, image height, canvas width, canvas height) base_scale_factor was fitted to
+        self._fit_key = None
+
+        # Cached canvas<->image scale (updated by _recompute_transform)
+        self._effective_scale = 1.0
+        self._inv_scale = 1.0
+
         # Drag state for panning
         self.panning = False
         self.drag_start = None
 
         # PhotoImage reference (must keep reference to prevent garbage collection)
         self.photo = None
+        self._image_id = None  # Canvas item showing self.photo, reused across frames
+
+        # Canvas background to restore on clear (frames use FRAME_BG)
+        self._canvas_bg = canvas.cget('bg')
+        self._frame_bg_active = False
+
+        # Overlay geometry in image coordinates and the canvas items drawing it
+        self._overlay = ((), False, (), ())
+        self._shown_transform = None  # (effective_scale, pan_offset) of the frame on screen
+        self._quad_id = None
+        self._scale_line_id = None
+        self._corner_marker_ids = []
+        self._scale_marker_ids = []
+
+        # Background frame building
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._frame_future = None
+        self._pending_frame = None
+        self._poll_after_id = None
+
+        # Resize destination reused while the display size stays the same (worker thread only)
+        self._resize_buf = None
+        self._resized = None  # (static image, its display-size copy) from the last frame
+
+        # Half-resolution levels of the last static image (built and read on the worker thread)
+        self._pyramid_source = None
+        self._pyramid = []
+
+    def _recompute_transform(self):
+        """Refresh the cached effective scale and its inverse"""
+        scale = self.base_scale_factor * self.zoom_level
+
+        # Keep snapped power-of-two scales exact despite the zoom_level round trip
+        nearest = 2.0 ** round(math.log2(scale))
+        if abs(scale - nearest) < 1e-9 * nearest:
+            scale = nearest
+
+        self._effective_scale = scale
+        self._inv_scale = 1.0 / self._effective_scale
+
+    def _snap_zoom(self):
+        """Snap zoom_level so the display scale is a power of two if it is already close to one"""
+        scale = self.base_scale_factor * self.zoom_level
+        nearest = 2.0 ** min(3, max(-3, round(math.log2(scale))))
+        if abs(scale / nearest - 1.0) < self.ZOOM_SNAP_TOLERANCE:
+            self.zoom_level = nearest / self.base_scale_factor
 
     def update_canvas_size(self, width, height):
         """Update canvas dimensions"""
@@ -39,6 +117,7 @@ class ImageCanvas:
         self.zoom_level = 1.0
         self.pan_offset = [0.0, 0.0]
         self.needs_initial_center = True
+        self._recompute_transform()
 
     def zoom_in(self, center_x=None, center_y=None):
         """Zoom in by 20%, centered on given point"""
@@ -48,7 +127,10 @@ class ImageCanvas:
             center_y = self.canvas_height / 2
 
         old_zoom = self.zoom_level
-        self.zoom_level = min(self.zoom_level * 1.2, 10.0)
+        self.zoom_level *= 1.2
+        self._snap_zoom()
+        self.zoom_level = min(self.zoom_level, 10.0)
+        self._recompute_transform()
 
         # Adjust pan to keep the cursor position fixed
         zoom_ratio = self.zoom_level / old_zoom
@@ -63,7 +145,10 @@ class ImageCanvas:
             center_y = self.canvas_height / 2
 
         old_zoom = self.zoom_level
-        self.zoom_level = max(self.zoom_level / 1.2, 0.1)
+        self.zoom_level /= 1.2
+        self._snap_zoom()
+        self.zoom_level = max(self.zoom_level, 0.1)
+        self._recompute_transform()
 
         # Adjust pan to keep the cursor position fixed
         zoom_ratio = self.zoom_level / old_zoom
@@ -75,60 +160,151 @@ class ImageCanvas:
         self.zoom_level = 1.0
         self.pan_offset = [0.0, 0.0]
         self.needs_initial_center = True
+        self._recompute_transform()
 
     def get_zoom_percentage(self):
         """Get current zoom level as percentage"""
-        return int(self.zoom_level * self.base_scale_factor * 100)
+        return int(self._effective_scale * 100)
 
     def clear(self):
         """Clear the canvas"""
+        self._cancel_frames()
         self.canvas.delete("all")
         self.photo = None
+        self._image_id = None
+        self._overlay = ((), False, (), ())
+        self._shown_transform = None
+        self._quad_id = None
+        self._scale_line_id = None
+        self._corner_marker_ids = []
+        self._scale_marker_ids = []
+        if self._frame_bg_active:
+            self.canvas.configure(bg=self._canvas_bg)
+            self._frame_bg_active = False
 
     def canvas_to_image_coords(self, canvas_x, canvas_y):
         """Convert canvas coordinates to image coordinates"""
-        effective_scale = self.base_scale_factor * self.zoom_level
-        img_x = (canvas_x - self.pan_offset[0]) / effective_scale
-        img_y = (canvas_y - self.pan_offset[1]) / effective_scale
+        img_x = (canvas_x - self.pan_offset[0]) * self._inv_scale
+        img_y = (canvas_y - self.pan_offset[1]) * self._inv_scale
         return img_x, img_y
 
     def image_to_canvas_coords(self, img_x, img_y):
         """Convert image coordinates to canvas coordinates"""
-        effective_scale = self.base_scale_factor * self.zoom_level
-        canvas_x = img_x * effective_scale + self.pan_offset[0]
-        canvas_y = img_y * effective_scale + self.pan_offset[1]
+        canvas_x = img_x * self._effective_scale + self.pan_offset[0]
+        canvas_y = img_y * self._effective_scale + self.pan_offset[1]
         return canvas_x, canvas_y
 
-    def display_image(self, image_rgb, overlay_callback=None):
+    def image_to_canvas_coords_array(self, points, effective_scale=None, pan_offset=None):
+        """
+        Convert a sequence of image points to canvas coordinates in one pass
+
+        Args:
+            points: sequence of (x, y) image coordinates
+            effective_scale: scale to use instead of the current one (optional)
+            pan_offset: pan offset to use instead of the current one (optional)
+
+        Returns:
+            (N, 2) float numpy array of canvas coordinates
+        """
+        if effective_scale is None:
+            effective_scale = self._effective_scale
+        if pan_offset is None:
+            pan_offset = self.pan_offset
+        pts = np.asarray(points, dtype=np.float64).reshape(-1, 2)
+        return pts * effective_scale + pan_offset
+
+    def set_overlay(self, quad_points=(), closed=False, corner_points=(), scale_points=()):
+        """
+        Set the points and lines drawn over the image
+
+        The overlay is drawn with canvas items, so changing it only moves
+        those items and never re-renders the image.
+
+        Args:
+            quad_points: image points joined by the outline, in drawing order
+            closed: join the last quad point back to the first
+            corner_points: image points drawn as corner markers
+            scale_points: scale calibration endpoints (line drawn when there are two)
+        """
+        self._overlay = (quad_points, closed, corner_points, scale_points)
+        if self._shown_transform is not None:
+            self._update_overlay_items(*self._shown_transform)
+
+    def _update_overlay_items(self, effective_scale, pan_offset):
+        """Move the overlay items to match an image shown at effective_scale and pan_offset"""
+        quad_points, closed, corner_points, scale_points = self._overlay
+        quad = self.image_to_canvas_coords_array(quad_points, effective_scale, pan_offset)
+        corners = self.image_to_canvas_coords_array(corner_points, effective_scale, pan_offset)
+        scale = self.image_to_canvas_coords_array(scale_points, effective_scale, pan_offset)
+
+        if closed and len(quad) > 0:
+            quad = np.vstack((quad, quad[:1]))
+
+        self._scale_line_id = self._update_line(self._scale_line_id, scale if len(scale) == 2 else (),
+                                                self.SCALE_COLOR, 1)
+        self._update_markers(self._scale_marker_ids, scale, self.SCALE_COLOR, self.SCALE_COLOR)
+        self._quad_id = self._update_line(self._quad_id, quad, self.QUAD_COLOR, 2)
+        self._update_markers(self._corner_marker_ids, corners, self.POINT_OUTER_COLOR, self.POINT_INNER_COLOR)
+
+    def _update_line(self, item_id, coords, color, width):
+        """Create, move or delete a polyline item; returns the item id (None if deleted)"""
+        if len(coords) < 2:
+            if item_id is not None:
+                self.canvas.delete(item_id)
+            return None
+
+        flat = np.ravel(coords).tolist()
+        if item_id is None:
+            return self.canvas.create_line(*flat, fill=color, width=width)
+        self.canvas.coords(item_id, *flat)
+        return item_id
+
+    def _update_markers(self, marker_ids, coords, outer_color, inner_color):
+        """Place one (ring, dot) oval pair per point, creating or deleting items as needed"""
+        r = self.MARKER_RADIUS
+        d = self.MARKER_DOT_RADIUS
+        for i, (x, y) in enumerate(np.asarray(coords).tolist()):
+            if i == len(marker_ids):
+                marker_ids.append((self.canvas.create_oval(0, 0, 0, 0, outline=outer_color),
+                                   self.canvas.create_oval(0, 0, 0, 0, outline=inner_color, fill=inner_color)))
+            ring, dot = marker_ids[i]
+            self.canvas.coords(ring, x - r, y - r, x + r, y + r)
+            self.canvas.coords(dot, x - d, y - d, x + d, y + d)
+
+        for ring, dot in marker_ids[len(coords):]:
+            self.canvas.delete(ring, dot)
+        del marker_ids[len(coords):]
+
+    def display_image(self, image_rgb, static=False):
         """
         Display an image on the canvas with current zoom/pan settings
 
+        The resize runs on a worker thread; the Tk blit and the overlay
+        update happen back on the main thread once the frame is ready.
+
         Args:
             image_rgb: numpy array in RGB format
-            overlay_callback: optional function(canvas_image, effective_scale, pan_offset)
-                            to draw overlays on the canvas image
+            static: True if image_rgb is never modified in place, so a
+                    pyramid of downscaled copies can be kept for it
         """
         if image_rgb is None:
             return
 
         height, width = image_rgb.shape[:2]
 
-        # Calculate base scale to fit canvas (with small margin)
-        scale_w = self.canvas_width / width
-        scale_h = self.canvas_height / height
-        self.base_scale_factor = min(scale_w, scale_h) * 0.98  # 98% to ensure it fits
+        # Calculate base scale to fit canvas (with small margin), only when
+        # the image or canvas size changed; zoom changes refresh the transform themselves
+        fit_key = (width, height, self.canvas_width, self.canvas_height)
+        if fit_key != self._fit_key:
+            self._fit_key = fit_key
+            scale_w = self.canvas_width / width
+            scale_h = self.canvas_height / height
+            self.base_scale_factor = min(scale_w, scale_h) * 0.98  # 98% to ensure it fits
+            self._recompute_transform()
+        effective_scale = self._effective_scale
 
-        # Apply zoom
-        effective_scale = self.base_scale_factor * self.zoom_level
-
-        new_width = int(width * effective_scale)
-        new_height = int(height * effective_scale)
-
-        # Resize for display
-        display_image = cv3.resize(image_rgb, new_width, new_height)
-
-        # Create canvas-sized image with background
-        canvas_image = np.full((self.canvas_height, self.canvas_width, 3), 64, dtype=np.uint8)
+        new_width = max(1, int(width * effective_scale))
+        new_height = max(1, int(height * effective_scale))
 
         # Center the image on initial load or fit
         if self.needs_initial_center:
@@ -137,35 +313,194 @@ class ImageCanvas:
             self.pan_offset = [center_x, center_y]
             self.needs_initial_center = False
 
+        # Snapshot the view state so the worker never sees it change mid-frame
+        frame = (image_rgb, new_width, new_height, effective_scale,
+                 (self.pan_offset[0], self.pan_offset[1]),
+                 self.canvas_width, self.canvas_height, static)
+
+        if self._frame_future is not None:
+            # A frame is already being built; only the latest request matters
+            self._pending_frame = frame
+            return
+
+        self._submit_frame(frame)
+
+    def _submit_frame(self, frame):
+        """Hand a frame snapshot to the worker thread"""
+        self._frame_future = self._executor.submit(self._build_frame, frame)
+        self._poll_after_id = self.canvas.after(self.FRAME_POLL_MS, self._poll_frame, frame)
+
+    def _build_frame(self, frame):
+        """Resize a frame and crop it to the visible region (worker thread)
+
+        Returns:
+            tuple: (image, (x, y)) to place on the canvas, where image is None
+                   if no part of the image is visible
+        """
+        image_rgb, new_width, new_height, _, pan_offset, canvas_width, canvas_height, static = frame
+
         # Calculate positions for placing the image on canvas
-        x_offset = int(max(0, self.pan_offset[0]))
-        y_offset = int(max(0, self.pan_offset[1]))
+        x_offset = int(max(0, pan_offset[0]))
+        y_offset = int(max(0, pan_offset[1]))
 
         # Calculate which part of the display image to show
-        img_x_start = int(max(0, -self.pan_offset[0]))
-        img_y_start = int(max(0, -self.pan_offset[1]))
+        img_x_start = int(max(0, -pan_offset[0]))
+        img_y_start = int(max(0, -pan_offset[1]))
 
         # Calculate how much of the image can fit on canvas
-        img_x_end = int(min(new_width, img_x_start + self.canvas_width - x_offset))
-        img_y_end = int(min(new_height, img_y_start + self.canvas_height - y_offset))
+        img_x_end = int(min(new_width, img_x_start + canvas_width - x_offset))
+        img_y_end = int(min(new_height, img_y_start + canvas_height - y_offset))
+
+        # Blit just the visible portion and let the canvas background show around it
+        if img_y_end <= img_y_start or img_x_end <= img_x_start:
+            return None, (0, 0)
+
+        # Zoomed in past 1:1 with part of the image off canvas: resample only the
+        # visible window instead of enlarging the whole image and cropping it
+        visible_size = (img_x_end - img_x_start, img_y_end - img_y_start)
+        if new_width > image_rgb.shape[1] and visible_size != (new_width, new_height):
+            window = self._resample_window(image_rgb, new_width, new_height, img_x_start, img_y_start, visible_size)
+            return window, (x_offset, y_offset)
+
+        # Panning a static image keeps the display size, so the last resize can be reused
+        resized = self._resized
+        if static and resized is not None and resized[0] is image_rgb and resized[1].shape[:2] == (new_height, new_width):
+            display_image = resized[1]
+        else:
+            display_image = self._resize(image_rgb, new_width, new_height, static)
+            self._resized = (image_rgb, display_image) if static else None
+
+        return display_image[img_y_start:img_y_end, img_x_start:img_x_end], (x_offset, y_offset)
+
+    def _scratch(self, shape, dtype):
+        """Return the scratch buffer, reallocated only if its shape or type changed (worker thread)"""
+        buf = self._resize_buf
+        if buf is None or buf.shape != shape or buf.dtype != dtype:
+            buf = np.empty(shape, dtype=dtype)
+            self._resize_buf = buf
+        return buf
+
+    def _resample_window(self, image_rgb, new_width, new_height, x, y, size):
+        """
+        Render one window of image_rgb enlarged to (new_width, new_height) (worker thread)
 
-        # Place the visible portion of the image on canvas
-        if img_y_end > img_y_start and img_x_end > img_x_start:
-            visible_portion = display_image[img_y_start:img_y_end, img_x_start:img_x_end]
-            h, w = visible_portion.shape[:2]
-            canvas_image[y_offset:y_offset+h, x_offset:x_offset+w] = visible_portion
+        Samples the same source positions as cv2.resize with INTER_LINEAR, so
+        the window matches the corresponding crop of a full resize.
 
-        # Call overlay callback if provided
-        if overlay_callback:
-            overlay_callback(canvas_image, effective_scale, self.pan_offset)
+        Args:
+            image_rgb: source image
+            new_width, new_height: size of the whole enlarged image
+            x, y: top-left corner of the window in the enlarged image
+            size: window size as (width, height)
 
-        # Convert to PhotoImage
-        img_pil = Image.fromarray(canvas_image)
-        self.photo = ImageTk.PhotoImage(image=img_pil)
+        Returns:
+            numpy array: The window (in the scratch buffer)
+        """
+        inv_x = image_rgb.shape[1] / new_width
+        inv_y = image_rgb.shape[0] / new_height
+        M_inv = np.array([[inv_x, 0.0, (x + 0.5) * inv_x - 0.5],
+                          [0.0, inv_y, (y + 0.5) * inv_y - 0.5]])
+
+        buf = self._scratch((size[1], size[0]) + image_rgb.shape[2:], image_rgb.dtype)
+        self._resized = None  # the scratch buffer no longer holds a full resize
+        return cv2.warpAffine(image_rgb, M_inv, size, dst=buf, flags=cv2.INTER_LINEAR | cv2.WARP_INVERSE_MAP,
+                              borderMode=cv2.BORDER_REPLICATE)
+
+    def _resize(self, image_rgb, new_width, new_height, static):
+        """Resize image_rgb to the display size into the scratch buffer (worker thread)
+
+        Returns:
+            numpy array: Display-size image (the scratch buffer, or a pyramid
+                         level or image_rgb itself when already the right size)
+        """
+        # Start from the smallest pyramid level that is still at least display size
+        source = image_rgb
+        if static:
+            for level in self._get_pyramid(image_rgb):
+                if level.shape[1] < new_width or level.shape[0] < new_height:
+                    break
+                source = level
+
+        # Power-of-two display scales match a pyramid level (or the image) exactly
+        if source.shape[:2] == (new_height, new_width):
+            return source
+
+        # Reuse the scratch buffer; the previous frame has already been
+        # copied into the PhotoImage before the next one is submitted
+        buf = self._scratch((new_height, new_width) + source.shape[2:], source.dtype)
+
+        # Area averaging when shrinking avoids aliasing
+        interpolation = cv2.INTER_AREA if new_width < source.shape[1] else cv2.INTER_LINEAR
+        return cv2.resize(source, (new_width, new_height), dst=buf, interpolation=interpolation)
+
+    def _get_pyramid(self, image_rgb):
+        """Return successively halved copies of image_rgb, building them on first use (worker thread)"""
+        if image_rgb is not self._pyramid_source:
+            self._pyramid_source = image_rgb
+            self._pyramid = []
+            level = image_rgb
+            while min(level.shape[:2]) >= 2 * self.PYRAMID_MIN_SIZE:
+                level = cv2.resize(level, (level.shape[1] // 2, level.shape[0] // 2), interpolation=cv2.INTER_AREA)
+                self._pyramid.append(level)
+        return self._pyramid
+
+    def _poll_frame(self, frame):
+        """Blit a finished frame to the canvas and start the next pending one"""
+        if not self._frame_future.done():
+            self._poll_after_id = self.canvas.after(self.FRAME_POLL_MS, self._poll_frame, frame)
+            return
+
+        future = self._frame_future
+        self._frame_future = None
+        self._poll_after_id = None
+        canvas_image, (x, y) = future.result()
+        _, _, _, effective_scale, pan_offset, _, _, _ = frame
+
+        if not self._frame_bg_active:
+            self.canvas.configure(bg=self.FRAME_BG)
+            self._frame_bg_active = True
 
         # Update canvas
-        self.canvas.delete("all")
-        self.canvas.create_image(0, 0, anchor=tk.NW, image=self.photo)
+        if canvas_image is None:
+            if self._image_id is not None:
+                self.canvas.delete(self._image_id)
+                self._image_id = None
+        else:
+            # Hand Pillow the visible rows in place with their row stride, so the
+            # cropped view is read straight from the resize buffer without a compacting copy
+            h, w = canvas_image.shape[:2]
+            stride = canvas_image.strides[0]
+            rows = np.lib.stride_tricks.as_strided(canvas_image, shape=((h - 1) * stride + w * 3,), strides=(1,))
+            img_pil = Image.frombuffer('RGB', (w, h), rows, 'raw', 'RGB', stride, 1)
+            if self.photo is not None and (self.photo.width(), self.photo.height()) == img_pil.size:
+                # Same size as the last frame: copy the pixels into the existing PhotoImage
+                self.photo.paste(img_pil)
+            else:
+                self.photo = ImageTk.PhotoImage(image=img_pil)
+
+            if self._image_id is None:
+                self._image_id = self.canvas.create_image(x, y, anchor=tk.NW, image=self.photo)
+                self.canvas.tag_lower(self._image_id)  # keep overlay items on top
+            else:
+                self.canvas.itemconfig(self._image_id, image=self.photo)
+                self.canvas.coords(self._image_id, x, y)
+
+        # Move the overlay to match the frame now on screen
+        self._shown_transform = (effective_scale, pan_offset)
+        self._update_overlay_items(effective_scale, pan_offset)
+
+        if self._pending_frame is not None:
+            pending = self._pending_frame
+            self._pending_frame = None
+            self._submit_frame(pending)
+
+    def _cancel_frames(self):
+        """Drop any frame that is queued or still being built"""
+        self._pending_frame = None
+        if self._poll_after_id is not None:
+            self.canvas.after_cancel(self._poll_after_id)
+            self._poll_after_id = None
+        self._frame_future = None
 
     def start_pan(self, x, y):
         """Start panning operation"""
@@ -0,0 +1,171 @@
+"""
+PerspectiveWarper - Applies perspective warps, on the GPU when one is available.
+"""
+
+import logging
+import threading
+import cv2
+import numpy as np
+
+
+class PerspectiveWarper:
+    """
+    Applies perspective warps to images.
+
+    Uses OpenCV's CUDA module when a CUDA-capable device is present, then
+    OpenCL (through cv2.UMat) when a GPU OpenCL device is present, and
+    falls back to the CPU otherwise. The GPU source image is kept between
+    calls, so re-warping the same image with a new matrix only transfers
+    the result back to the host.
+
+    Safe to call from more than one thread. GPU warps are serialized because
+    they share the cached source and stream; CPU warps run concurrently.
+    """
+
+    def __init__(self):
+        """Initialize the warper and detect CUDA support once"""
+        self.use_cuda = self._detect_cuda()
+        self.use_opencl = not self.use_cuda and self._detect_opencl()
+
+        # Serializes GPU warps so the stream and cached source aren't shared mid-call
+        self._lock = threading.Lock()
+
+        # Persistent GPU state (only used when CUDA is available)
+        self._stream = None
+        self._gpu_src = None
+        self._gpu_src_image = None  # Host array currently uploaded to _gpu_src
+        self._umat_src = None  # OpenCL copy of _gpu_src_image (only used with OpenCL)
+
+        if self.use_cuda:
+            self._stream = cv2.cuda.Stream()
+            self._gpu_src = cv2.cuda_GpuMat()
+            logging.info("CUDA device found, perspective warps will run on the GPU")
+        elif self.use_opencl:
+            logging.info("OpenCL GPU found, perspective warps will run on the GPU")
+
+    @property
+    def on_gpu(self):
+        """True if warp() runs on the GPU (CUDA or OpenCL)"""
+        return self.use_cuda or self.use_opencl
+
+    @staticmethod
+    def _detect_cuda():
+        """Check whether OpenCV was built with CUDA and a device is present"""
+        try:
+            return cv2.cuda.getCudaEnabledDeviceCount() > 0
+        except (AttributeError, cv2.error):
+            return False
+
+    @staticmethod
+    def _detect_opencl():
+        """Check whether OpenCV's OpenCL path is enabled and runs on a GPU device"""
+        try:
+            # Respect the process-wide setting rather than turning OpenCL on here
+            if not cv2.ocl.haveOpenCL() or not cv2.ocl.useOpenCL():
+                return False
+            device = cv2.ocl.Device.getDefault()
+            return bool(device.type() & cv2.ocl.DEVICE_TYPE_GPU)
+        except (AttributeError, cv2.error):
+            return False
+
+    def warp(self, image, M, size, flags=cv2.INTER_LINEAR, dst=None):
+        """
+        Apply a perspective transform to an image.
+
+        Args:
+            image: numpy array (any channel order)
+            M: 3x3 perspective transform matrix
+            size: Output size as (width, height)
+            flags: OpenCV interpolation flags (default: INTER_LINEAR)
+            dst: Optional preallocated output array of the right size and type.
+                 The OpenCL path returns its download instead of copying into dst.
+
+        Returns:
+            numpy array with the warped image
+        """
+        if self.on_gpu:
+            with self._lock:
+                result = self._warp_gpu(image, M, size, flags, dst)
+            if result is not None:
+                return result
+
+        # The CPU path keeps no shared state, so it never waits behind another warp
+        return cv2.warpPerspective(image, M, size, dst=dst, flags=flags)
+
+    def _warp_gpu(self, image, M, size, flags, dst):
+        """Warp on the GPU with the lock held, or return None if no GPU path is left"""
+        if self.use_cuda:
+            try:
+                return self._warp_cuda(image, M, size, flags, dst)
+            except cv2.error as e:
+                # Disable the GPU path for the rest of the session
+                logging.error(f"CUDA warp failed, falling back to CPU: {str(e)}")
+                self.release()
+                self.use_cuda = False
+
+        if self.use_opencl:
+            try:
+                return self._warp_opencl(image, M, size, flags, dst)
+            except cv2.error as e:
+                # Disable the OpenCL path for the rest of the session
+                logging.error(f"OpenCL warp failed, falling back to CPU: {str(e)}")
+                self.release()
+                self.use_opencl = False
+
+        return None
+
+    @staticmethod
+    def build_maps(M_inv, size):
+        """
+        Precompute remap tables for a perspective warp.
+
+        Args:
+            M_inv: 3x3 matrix mapping output pixels to source pixels
+            size: Output size as (width, height)
+
+        Returns:
+            tuple: (map1, map2) in OpenCV's fixed-point CV_16SC2 form
+        """
+        eye = np.eye(3)
+        # initUndistortRectifyMap inverts R itself, so it takes the forward transform
+        return cv2.initUndistortRectifyMap(eye, None, np.linalg.inv(M_inv), eye, size, cv2.CV_16SC2)
+
+    def remap(self, image, map1, map2, dst=None):
+        """
+        Resample an image through tables from build_maps (bilinear, CPU).
+
+        Args:
+            image: numpy array (any channel order)
+            map1, map2: Remap tables from build_maps
+            dst: Optional preallocated output array of the right size and type
+
+        Returns:
+            numpy array with the warped image
+        """
+        return cv2.remap(image, map1, map2, cv2.INTER_LINEAR, dst=dst)
+
+    def _warp_cuda(self, image, M, size, flags, dst=None):
+        """Warp on the GPU, re-uploading the source only when it changed"""
+        if image is not self._gpu_src_image:
+            self._gpu_src.upload(image, self._stream)
+            self._gpu_src_image = image
+
+        gpu_dst = cv2.cuda.warpPerspective(self._gpu_src, M, size, flags=flags, stream=self._stream)
+        self._stream.waitForCompletion()
+        return gpu_dst.download(dst) if dst is not None else gpu_dst.download()
+
+    def _warp_opencl(self, image, M, size, flags, dst=None):
+        """Warp through OpenCL, re-uploading the source only when it changed"""
+        if image is not self._gpu_src_image:
+            self._umat_src = cv2.UMat(image)
+            self._gpu_src_image = image
+
+        # UMat.get() always allocates, so return the download rather than copying it into dst
+        return cv2.warpPerspective(self._umat_src, M, size, flags=flags).get()
+
+    def release(self):
+        """Drop the cached GPU source image"""
+        self._gpu_src_image = None
+        self._umat_src = None
+        if self._gpu_src is not None:
+            self._gpu_src.release()
@@ -2,7 +2,7 @@
 ScaleCalibrator - Manages scale calibration workflow for accurate measurements.
 """
 
-import numpy as np
+import math
 
 
 class ScaleCalibrator:
@@ -93,8 +93,7 @@ class ScaleCalibrator:
             return None
 
         pt1, pt2 = self.points
-        distance = np.sqrt((pt2[0] - pt1[0])**2 + (pt2[1] - pt1[1])**2)
-        return float(distance)
+        return math.hypot(pt2[0] - pt1[0], pt2[1] - pt1[1])
 
     def set_real_world_length(self, length):
         """
@@ -145,13 +144,15 @@ class ScaleCalibrator:
             threshold: Maximum distance in pixels
 
         Returns:
-            int: Index of point (0 or 1), or None if no point nearby
+            int: Index of the nearest point (0 or 1), or None if no point nearby
         """
-        for i, (px, py) in enumerate(self.points):
-            distance = np.sqrt((x - px)**2 + (y - py)**2)
-            if distance <= threshold:
-                return i
-        return None
+        if not self.points:
+            return None
+
+        # Compare squared distances; no square root needed for a threshold test
+        d2 = [(x - px)**2 + (y - py)**2 for px, py in self.points]
+        index = min(range(len(d2)), key=d2.__getitem__)
+        return index if d2[index] <= threshold * threshold else None
 
     def update_point(self, index, x, y):
         """
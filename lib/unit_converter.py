@@ -19,6 +19,11 @@ class UnitConverter:
     # Conversion constant
     MM_PER_INCH = 25.4
 
+    # Per-unit lookups (units other than "pixels" and "inches" are treated as mm)
+    UNITS_PER_INCH = {"inches": 1.0, "mm": MM_PER_INCH}
+    UNIT_LABELS = {"pixels": "px", "inches": "in", "mm": "mm"}
+    SPINBOX_INCREMENTS = {"pixels": 1, "inches": 0.1, "mm": 0.5}
+
     def __init__(self, units="mm", dpi=300, scale_factor=1.0):
         """
         Initialize the unit converter.
@@ -32,6 +37,10 @@ class UnitConverter:
         self.dpi = dpi
         self.scale_factor = scale_factor
 
+        # Pixels per unit for each unit type at _factors_dpi (rebuilt when the DPI changes)
+        self._factors_dpi = None
+        self._factors = {}
+
     def set_units(self, units):
         """Change the current unit type"""
         self.units = units
@@ -48,6 +57,30 @@ class UnitConverter:
         """Check if scale has been calibrated"""
         return self.scale_factor != 1.0
 
+    def pixels_per_unit(self, units=None, dpi=None):
+        """
+        Get the number of pixels in one unit.
+
+        Args:
+            units: Unit type (uses current if not specified)
+            dpi: DPI to use (uses current if not specified)
+
+        Returns:
+            Float pixels per unit (1.0 for pixels)
+        """
+        if units is None:
+            units = self.units
+        if dpi is None:
+            dpi = self.dpi
+
+        # Divide by MM_PER_INCH once per DPI rather than per conversion (multiplying
+        # by a rounded 1/25.4 instead would truncate more mm values to the wrong pixel)
+        if dpi != self._factors_dpi:
+            self._factors = {u: dpi / per_inch for u, per_inch in self.UNITS_PER_INCH.items()}
+            self._factors["pixels"] = 1.0
+            self._factors_dpi = dpi
+        return self._factors.get(units, self._factors["mm"])
+
     def units_to_pixels(self, value, units=None, dpi=None):
         """
         Convert value in current units to pixels.
@@ -60,17 +93,7 @@ class UnitConverter:
         Returns:
             Integer pixel value
         """
-        if units is None:
-            units = self.units
-        if dpi is None:
-            dpi = self.dpi
-
-        if units == "pixels":
-            return int(value)
-        elif units == "inches":
-            return int(value * dpi)
-        else:  # mm
-            return int((value / self.MM_PER_INCH) * dpi)
+        return int(value * self.pixels_per_unit(units, dpi))
 
     def pixels_to_units(self, pixels, units=None, dpi=None, use_scale=False):
         """
@@ -85,22 +108,12 @@ class UnitConverter:
         Returns:
             Float value in target units
         """
-        if units is None:
-            units = self.units
-        if dpi is None:
-            dpi = self.dpi
-
         # If scale is calibrated and we're asked to use it
         if use_scale and self.is_calibrated():
             return pixels / self.scale_factor
 
         # Otherwise use DPI conversion
-        if units == "pixels":
-            return float(pixels)
-        elif units == "inches":
-            return pixels / dpi
-        else:  # mm
-            return (pixels / dpi) * self.MM_PER_INCH
+        return pixels / self.pixels_per_unit(units, dpi)
 
     def convert_units(self, value, from_units, to_units, dpi=None):
         """
@@ -115,14 +128,8 @@ class UnitConverter:
         Returns:
             Float value in target units
         """
-        if dpi is None:
-            dpi = self.dpi
-
-        # Convert to pixels first (common intermediate)
-        pixels = self.units_to_pixels(value, units=from_units, dpi=dpi)
-
-        # Convert from pixels to target units
-        return self.pixels_to_units(pixels, units=to_units, dpi=dpi, use_scale=False)
+        # Go through pixels without rounding to whole pixels on the way
+        return value * self.pixels_per_unit(from_units, dpi) / self.pixels_per_unit(to_units, dpi)
 
     def get_unit_label(self, units=None):
         """
@@ -136,13 +143,7 @@ class UnitConverter:
         """
         if units is None:
             units = self.units
-
-        if units == "pixels":
-            return "px"
-        elif units == "inches":
-            return "in"
-        else:
-            return "mm"
+        return self.UNIT_LABELS.get(units, "mm")
 
     def get_spinbox_increment(self, units=None):
         """
@@ -156,10 +157,4 @@ class UnitConverter:
         """
         if units is None:
             units = self.units
-
-        if units == "pixels":
-            return 1
-        elif units == "inches":
-            return 0.1
-        else:  # mm
-            return 0.5
+        return self.SPINBOX_INCREMENTS.get(units, 0.5)
@@ -3,6 +3,7 @@ Generate dewarp.ico - Icon showing perspective grid with corner points
 """
 
 from PIL import Image, ImageDraw
+import numpy as np
 import math
 
 def create_dewarp_icon(size):
@@ -36,24 +37,19 @@ def create_dewarp_icon(size):
 
     # Draw grid lines inside the quadrilateral
     grid_lines = 4
-    for i in range(1, grid_lines):
-        t = i / grid_lines
-        # Horizontal lines
-        left_x = bl[0] + t * (tl[0] - bl[0])
-        left_y = bl[1] + t * (tl[1] - bl[1])
-        right_x = br[0] + t * (tr[0] - br[0])
-        right_y = br[1] + t * (tr[1] - br[1])
+    line_width = max(1, size // 80)
 
-        line_width = max(1, size // 80)
-        draw.line([left_x, left_y, right_x, right_y], fill=grid_color, width=line_width)
+    # Interpolate every grid line endpoint along the quad edges at once
+    t = (np.arange(1, grid_lines) / grid_lines)[:, None]
+    p_tl, p_tr, p_br, p_bl = np.array([tl, tr, br, bl])
+    lefts = p_bl + t * (p_tl - p_bl)
+    rights = p_br + t * (p_tr - p_br)
+    bottoms = p_bl + t * (p_br - p_bl)
+    tops = p_tl + t * (p_tr - p_tl)
 
-        # Vertical lines
-        bottom_x = bl[0] + t * (br[0] - bl[0])
-        bottom_y = bl[1] + t * (br[1] - bl[1])
-        top_x = tl[0] + t * (tr[0] - tl[0])
-        top_y = tl[1] + t * (tr[1] - tl[1])
-
-        draw.line([bottom_x, bottom_y, top_x, top_y], fill=grid_color, width=line_width)
+    for left, right, bottom, top in zip(lefts.tolist(), rights.tolist(), bottoms.tolist(), tops.tolist()):
+        draw.line(left + right, fill=grid_color, width=line_width)  # Horizontal line
+        draw.line(bottom + top, fill=grid_color, width=line_width)  # Vertical line
 
     # Draw the outline of the quadrilateral in green
     outline_width = max(2, size // 40)
@@ -80,11 +76,10 @@ def generate_icon():
     # Common icon sizes for Windows .ico
     sizes = [256, 128, 64, 48, 32, 16]
 
-    images = []
-    for size in sizes:
-        print(f"Generating {size}x{size} icon...")
-        img = create_dewarp_icon(size)
-        images.append(img)
+    # Only the largest size is drawn; the ICO writer downsamples it (LANCZOS)
+    # for the smaller entries
+    print(f"Generating {sizes[0]}x{sizes[0]} icon...")
+    master = create_dewarp_icon(sizes[0])
 
     # Create assets directory if it doesn't exist
     assets_dir = os.path.join(os.path.dirname(__file__), "..", "assets")
@@ -92,12 +87,12 @@ def generate_icon():
 
     # Save as .ico file with multiple sizes
     output_path = os.path.join(assets_dir, "dewarp.ico")
-    images[0].save(output_path, format='ICO', sizes=[(s, s) for s in sizes])
+    master.save(output_path, format='ICO', sizes=[(s, s) for s in sizes])
     print(f"\nIcon saved as {output_path}")
 
     # Also save a PNG preview of the largest size
     preview_path = os.path.join(assets_dir, "dewarp_icon_preview.png")
-    images[0].save(preview_path, format='PNG')
+    master.save(preview_path, format='PNG')
     print(f"Preview saved as {preview_path}")
 
 if __name__ == "__main__":
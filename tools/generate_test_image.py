@@ -10,20 +10,22 @@ Creates a 22x30 cm green background with:
 import cv2
 import numpy as np
 import json
+import math
 
 # Configuration
 DPI = 300
-CM_TO_INCH = 1 / 2.54
+PX_PER_INCH = DPI
+PX_PER_CM = DPI / 2.54
 
 # Canvas dimensions
 WIDTH_CM = 22
 HEIGHT_CM = 30
-WIDTH_PX = int(WIDTH_CM * CM_TO_INCH * DPI)
-HEIGHT_PX = int(HEIGHT_CM * CM_TO_INCH * DPI)
+WIDTH_PX = int(WIDTH_CM * PX_PER_CM)
+HEIGHT_PX = int(HEIGHT_CM * PX_PER_CM)
 
 # Grid spacing
 GRID_CM = 1
-GRID_PX = int(GRID_CM * CM_TO_INCH * DPI)
+GRID_PX = int(GRID_CM * PX_PER_CM)
 
 # Colors (BGR format for OpenCV)
 GREEN_BG = (60, 140, 60)  # Darker green
@@ -40,44 +42,50 @@ print(f"  Grid spacing: {GRID_CM} cm ({GRID_PX} px)")
 image = np.full((HEIGHT_PX, WIDTH_PX, 3), DARK_GREY_BG, dtype=np.uint8)
 
 # Draw rounded rectangle for green background
-corner_radius = int(2 * CM_TO_INCH * DPI)  # 2 cm radius
-# OpenCV doesn't have a direct rounded rectangle fill, so we'll build it manually
-# Create a mask for the rounded rectangle
-mask = np.zeros((HEIGHT_PX, WIDTH_PX), dtype=np.uint8)
+corner_radius = int(2 * PX_PER_CM)  # 2 cm radius
+# OpenCV doesn't have a direct rounded rectangle fill, so we'll build it manually,
+# filling the shapes straight onto the image (no mask or full-size green layer needed)
 
 # Draw the main rectangle body
-cv2.rectangle(mask, (corner_radius, 0), (WIDTH_PX - corner_radius, HEIGHT_PX), 255, -1)
-cv2.rectangle(mask, (0, corner_radius), (WIDTH_PX, HEIGHT_PX - corner_radius), 255, -1)
+cv2.rectangle(image, (corner_radius, 0), (WIDTH_PX - corner_radius, HEIGHT_PX), GREEN_BG, -1)
+cv2.rectangle(image, (0, corner_radius), (WIDTH_PX, HEIGHT_PX - corner_radius), GREEN_BG, -1)
 
 # Draw the four corner circles
-cv2.circle(mask, (corner_radius, corner_radius), corner_radius, 255, -1)  # top-left
-cv2.circle(mask, (WIDTH_PX - corner_radius, corner_radius), corner_radius, 255, -1)  # top-right
-cv2.circle(mask, (corner_radius, HEIGHT_PX - corner_radius), corner_radius, 255, -1)  # bottom-left
-cv2.circle(mask, (WIDTH_PX - corner_radius, HEIGHT_PX - corner_radius), corner_radius, 255, -1)  # bottom-right
-
-# Apply green color where mask is set
-green_layer = np.full((HEIGHT_PX, WIDTH_PX, 3), GREEN_BG, dtype=np.uint8)
-image = np.where(mask[:, :, np.newaxis] == 255, green_layer, image)
+cv2.circle(image, (corner_radius, corner_radius), corner_radius, GREEN_BG, -1)  # top-left
+cv2.circle(image, (WIDTH_PX - corner_radius, corner_radius), corner_radius, GREEN_BG, -1)  # top-right
+cv2.circle(image, (corner_radius, HEIGHT_PX - corner_radius), corner_radius, GREEN_BG, -1)  # bottom-left
+cv2.circle(image, (WIDTH_PX - corner_radius, HEIGHT_PX - corner_radius), corner_radius, GREEN_BG, -1)  # bottom-right
 
 print("  [OK] Created green background with rounded corners facing outwards")
 
 # Draw grid lines starting 1 cm inside the green border
+# All lines are written at once by array indexing, with the same pixels
+# cv2.line(..., thickness=2) would draw: 3 px across plus a 1 px cap at each end
 grid_margin = GRID_PX  # 1 cm margin
-for y in range(grid_margin, HEIGHT_PX - grid_margin + 1, GRID_PX):
-    cv2.line(image, (grid_margin, y), (WIDTH_PX - grid_margin, y), GREY_GRID, 2)
+grid_ys = np.arange(grid_margin, HEIGHT_PX - grid_margin + 1, GRID_PX)
+grid_xs = np.arange(grid_margin, WIDTH_PX - grid_margin + 1, GRID_PX)
+line_across = np.arange(-1, 2)
+
+# Horizontal lines
+image[(grid_ys[:, None] + line_across).ravel(), grid_margin:WIDTH_PX - grid_margin + 1] = GREY_GRID
+image[grid_ys, grid_margin - 1] = GREY_GRID
+image[grid_ys, WIDTH_PX - grid_margin + 1] = GREY_GRID
 
-for x in range(grid_margin, WIDTH_PX - grid_margin + 1, GRID_PX):
-    cv2.line(image, (x, grid_margin), (x, HEIGHT_PX - grid_margin), GREY_GRID, 2)
+# Vertical lines
+image[grid_margin:HEIGHT_PX - grid_margin + 1, (grid_xs[:, None] + line_across).ravel()] = GREY_GRID
+image[grid_margin - 1, grid_xs] = GREY_GRID
+image[HEIGHT_PX - grid_margin + 1, grid_xs] = GREY_GRID
 
 print("  [OK] Drew 1 cm grid starting 1 cm inside border")
 
 # Function to draw rotated rectangle
 def draw_rotated_rectangle(img, center, width_px, height_px, angle_deg, color, label):
     """Draw a filled rectangle rotated by angle_deg"""
-    # Create rotation matrix
-    rect = ((center[0], center[1]), (width_px, height_px), angle_deg)
-    box = cv2.boxPoints(rect)
-    box = box.astype(int)
+    # Rotate the corner offsets about the center (same corners and order as cv2.boxPoints)
+    c, s = math.cos(math.radians(angle_deg)), math.sin(math.radians(angle_deg))
+    half_w, half_h = width_px / 2, height_px / 2
+    offsets = np.array([[-half_w, half_h], [-half_w, -half_h], [half_w, -half_h], [half_w, half_h]])
+    box = (np.asarray(center) + offsets @ np.array([[c, s], [-s, c]])).astype(np.int32)
 
     # Draw filled rectangle
     cv2.drawContours(img, [box], 0, color, -1)
@@ -92,8 +100,8 @@ def draw_rotated_rectangle(img, center, width_px, height_px, angle_deg, color, l
     return box
 
 # Rectangle 1: 2x3 inches, rotated 15 degrees clockwise
-rect1_width_px = int(2 * DPI)
-rect1_height_px = int(3 * DPI)
+rect1_width_px = int(2 * PX_PER_INCH)
+rect1_height_px = int(3 * PX_PER_INCH)
 rect1_center = (WIDTH_PX // 3, HEIGHT_PX // 3)
 rect1_angle = -15  # Negative = clockwise
 
@@ -103,8 +111,8 @@ box1 = draw_rotated_rectangle(image, rect1_center, rect1_width_px, rect1_height_
 print(f"  [OK] Drew rectangle 1: 2x3 inches ({rect1_width_px}x{rect1_height_px} px) at {rect1_angle} deg")
 
 # Rectangle 2: 7x5 cm, rotated 20 degrees counter-clockwise
-rect2_width_px = int(7 * CM_TO_INCH * DPI)
-rect2_height_px = int(5 * CM_TO_INCH * DPI)
+rect2_width_px = int(7 * PX_PER_CM)
+rect2_height_px = int(5 * PX_PER_CM)
 rect2_center = (2 * WIDTH_PX // 3, 2 * HEIGHT_PX // 3)
 rect2_angle = 20  # Positive = counter-clockwise
 
@@ -150,8 +158,9 @@ dst_points = np.array([
     [offset_bl_x, HEIGHT_PX - 1 - offset_bl_y]          # bottom-left (inward)
 ], dtype=np.float32)
 
-# Calculate perspective transform matrix
+# Calculate perspective transform matrix and its inverse (for unwarping)
 transform_matrix = cv2.getPerspectiveTransform(src_points, dst_points)
+inverse_matrix = np.linalg.inv(transform_matrix)
 
 # Apply warp with dark grey background
 warped_image = cv2.warpPerspective(image, transform_matrix, (WIDTH_PX, HEIGHT_PX),
@@ -199,7 +208,7 @@ metadata = {
         "source_points": src_points.tolist(),
         "destination_points": dst_points.tolist(),
         "matrix": transform_matrix.tolist(),
-        "inverse_matrix": np.linalg.inv(transform_matrix).tolist()
+        "inverse_matrix": inverse_matrix.tolist()
     }
 }
 
@@ -213,7 +222,7 @@ print(f"[OK] Saved metadata and transform matrix: {metadata_path}")
 print(f"\nPerspective Transform Matrix:")
 print(transform_matrix)
 print(f"\nInverse Transform Matrix (for unwrapping):")
-print(np.linalg.inv(transform_matrix))
+print(inverse_matrix)
 
 print("\n" + "="*60)
 print("Test image generation complete!")